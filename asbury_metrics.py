@@ -8,18 +8,60 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
 import streamlit as st
+from services.cache import disk_cache
+from services.data_fetcher import downcast_columns
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+# Tickers required by the Asbury 6 metrics
+BASKET_TICKERS = ('SPY', 'IWM', 'TLT', '^VIX')
+
+
 @st.cache_data(ttl=3600) # Cache data for 1 hour
-def fetch_ticker_data(ticker, start_date, end_date):
-    """Fetches historical data for a given ticker."""
-    return yf.download(ticker, start=start_date, end=end_date, progress=False)
+@disk_cache(ttl=3600) # Survives app restarts
+def fetch_basket(tickers_tuple, start_date, end_date):
+    """Fetches historical data for several tickers in one batched download."""
+    data = yf.download(
+        list(tickers_tuple), start=start_date, end=end_date,
+        group_by='ticker', threads=True, progress=False
+    )
+    return downcast_columns(
+        data,
+        float_cols=('Open', 'High', 'Low', 'Close', 'Adj Close'),
+        int_cols=('Volume',)
+    )
+
+# Overall signal labels indexed by signal code
+SIGNAL_LABELS = np.array(['NEUTRAL', 'BUY', 'CASH'])
 
+# Fewest bars every series needs for the 20-day windows and ROCs
+MIN_BARS = 21
 
-def calculate_market_breadth(spy_data):
+
+def fetch_basket_data(start_date, end_date):
+    """
+    Fetches SPY, IWM, TLT and VIX data with a single batched download.
+    
+    Returns:
+        Tuple of (spy_data, iwm_data, tlt_data, vix_data) with flattened columns
+    """
+    data = fetch_basket(BASKET_TICKERS, start_date, end_date)
+    
+    # Split the (ticker, field) columns once; drop dates a ticker did not trade
+    frames = []
+    for ticker in BASKET_TICKERS:
+        if ticker in data.columns.get_level_values(0):
+            frames.append(data[ticker].dropna(how='all'))
+        else:
+            frames.append(pd.DataFrame())
+    
+    return tuple(frames)
+
+
+def calculate_market_breadth(current_volume, avg_volume_20, current_price, high_20):
     """
     Market Breadth: Measures participation across the market.
     
@@ -27,19 +69,14 @@ def calculate_market_breadth(spy_data):
     Positive signal when recent volume is above average and price is making new highs.
     
     Args:
-        spy_data: DataFrame with SPY historical data
+        current_volume: Latest SPY volume
+        avg_volume_20: 20-day average SPY volume
+        current_price: Latest SPY close
+        high_20: 20-day SPY high
         
     Returns:
-        dict with name, value, status, and description
+        Tuple of (is_positive, dict with name, value, status, and description)
     """
-    # Calculate 20-day average volume
-    avg_volume_20 = spy_data['Volume'].rolling(window=20).mean().iloc[-1]
-    current_volume = spy_data['Volume'].iloc[-1]
-    
-    # Check if we're near 20-day highs
-    high_20 = spy_data['High'].rolling(window=20).max().iloc[-1]
-    current_price = spy_data['Close'].iloc[-1]
-    
     # Breadth is positive if volume is above average and price is near highs
     volume_ratio = current_volume / avg_volume_20
     price_ratio = current_price / high_20
@@ -47,7 +84,7 @@ def calculate_market_breadth(spy_data):
     # Positive if volume > 100% of avg and price within 2% of 20-day high
     is_positive = volume_ratio > 1.0 and price_ratio > 0.98
     
-    return {
+    return bool(is_positive), {
         'name': 'Market Breadth',
         'value': f'{volume_ratio:.2f}x avg volume, {price_ratio*100:.1f}% of 20d high',
         'status': 'Positive' if is_positive else 'Negative',
@@ -55,28 +92,25 @@ def calculate_market_breadth(spy_data):
     }
 
 
-def calculate_volume_strength(spy_data):
+def calculate_volume_strength(avg_volume_5, avg_volume_50):
     """
     Volume: Tracks trading activity and conviction.
     
     High volume reflects strong conviction; low volume signals indecision.
     
     Args:
-        spy_data: DataFrame with SPY historical data
+        avg_volume_5: 5-day average SPY volume
+        avg_volume_50: 50-day average SPY volume
         
     Returns:
-        dict with name, value, status, and description
+        Tuple of (is_positive, dict with name, value, status, and description)
     """
-    # Calculate 50-day average volume
-    avg_volume_50 = spy_data['Volume'].rolling(window=50).mean().iloc[-1]
-    recent_avg_volume_5 = spy_data['Volume'].rolling(window=5).mean().iloc[-1]
-    
-    volume_ratio = recent_avg_volume_5 / avg_volume_50
+    volume_ratio = avg_volume_5 / avg_volume_50
     
     # Positive if recent 5-day average is at least 110% of 50-day average
     is_positive = volume_ratio > 1.10
     
-    return {
+    return bool(is_positive), {
         'name': 'Volume',
         'value': f'{volume_ratio:.2f}x (5d avg / 50d avg)',
         'status': 'Positive' if is_positive else 'Negative',
@@ -84,29 +118,25 @@ def calculate_volume_strength(spy_data):
     }
 
 
-def calculate_relative_performance(spy_data, iwm_data):
+def calculate_relative_performance(spy_return, iwm_return):
     """
     Relative Performance: Compares small caps vs large caps.
     
     Outperformance by small caps (IWM vs SPY) suggests risk appetite.
     
     Args:
-        spy_data: DataFrame with SPY historical data
-        iwm_data: DataFrame with IWM historical data
+        spy_return: SPY 20-day return in percent
+        iwm_return: IWM 20-day return in percent
         
     Returns:
-        dict with name, value, status, and description
+        Tuple of (is_positive, dict with name, value, status, and description)
     """
-    # Calculate 20-day returns for both
-    spy_return = (spy_data['Close'].iloc[-1] / spy_data['Close'].iloc[-20] - 1) * 100
-    iwm_return = (iwm_data['Close'].iloc[-1] / iwm_data['Close'].iloc[-20] - 1) * 100
-    
     relative_performance = iwm_return - spy_return
     
     # Positive if IWM is outperforming SPY (suggests risk-on)
     is_positive = relative_performance > 0
     
-    return {
+    return bool(is_positive), {
         'name': 'Relative Performance',
         'value': f'IWM {iwm_return:+.1f}% vs SPY {spy_return:+.1f}%',
         'status': 'Positive' if is_positive else 'Negative',
@@ -114,27 +144,23 @@ def calculate_relative_performance(spy_data, iwm_data):
     }
 
 
-def calculate_asset_flows(spy_data, tlt_data):
+def calculate_asset_flows(spy_return, tlt_return):
     """
     Asset Flows: Reflects capital movement between stocks and bonds.
     
     Inflows to bonds (TLT outperforming) may signal risk-off sentiment.
     
     Args:
-        spy_data: DataFrame with SPY historical data
-        tlt_data: DataFrame with TLT historical data
+        spy_return: SPY 10-day return in percent
+        tlt_return: TLT 10-day return in percent
         
     Returns:
-        dict with name, value, status, and description
+        Tuple of (is_positive, dict with name, value, status, and description)
     """
-    # Calculate 10-day returns for both
-    spy_return = (spy_data['Close'].iloc[-1] / spy_data['Close'].iloc[-10] - 1) * 100
-    tlt_return = (tlt_data['Close'].iloc[-1] / tlt_data['Close'].iloc[-10] - 1) * 100
-    
     # Positive if stocks (SPY) outperforming bonds (TLT)
     is_positive = spy_return > tlt_return
     
-    return {
+    return bool(is_positive), {
         'name': 'Asset Flows',
         'value': f'SPY {spy_return:+.1f}% vs TLT {tlt_return:+.1f}%',
         'status': 'Positive' if is_positive else 'Negative',
@@ -142,7 +168,7 @@ def calculate_asset_flows(spy_data, tlt_data):
     }
 
 
-def calculate_volatility(vix_data):
+def calculate_volatility(current_vix, vix_20d_avg):
     """
     Volatility (VIX): Gauges expected market volatility and fear.
     
@@ -150,18 +176,16 @@ def calculate_volatility(vix_data):
     Low VIX suggests complacency and stable conditions.
     
     Args:
-        vix_data: DataFrame with VIX historical data
+        current_vix: Latest VIX close
+        vix_20d_avg: 20-day average VIX close
         
     Returns:
-        dict with name, value, status, and description
+        Tuple of (is_positive, dict with name, value, status, and description)
     """
-    current_vix = vix_data['Close'].iloc[-1]
-    vix_20d_avg = vix_data['Close'].rolling(window=20).mean().iloc[-1]
-    
     # Positive if VIX is below 20 and trending down
     is_positive = current_vix < 20 and current_vix < vix_20d_avg
     
-    return {
+    return bool(is_positive), {
         'name': 'Volatility (VIX)',
         'value': f'{current_vix:.2f} (20d avg: {vix_20d_avg:.2f})',
         'status': 'Positive' if is_positive else 'Negative',
@@ -169,28 +193,23 @@ def calculate_volatility(vix_data):
     }
 
 
-def calculate_price_roc(spy_data):
+def calculate_price_roc(roc_20, roc_10):
     """
     Price Rate of Change: Measures momentum of price moves.
     
     Captures how fast price is changing over time (slope of trendline).
     
     Args:
-        spy_data: DataFrame with SPY historical data
+        roc_20: SPY 20-day rate of change in percent
+        roc_10: SPY 10-day rate of change in percent
         
     Returns:
-        dict with name, value, status, and description
+        Tuple of (is_positive, dict with name, value, status, and description)
     """
-    # Calculate 20-day ROC
-    roc_20 = ((spy_data['Close'].iloc[-1] / spy_data['Close'].iloc[-20]) - 1) * 100
-    
-    # Also check if the trend is accelerating (10-day vs 20-day)
-    roc_10 = ((spy_data['Close'].iloc[-1] / spy_data['Close'].iloc[-10]) - 1) * 100
-    
-    # Positive if 20-day ROC is positive and accelerating
+    # Positive if 20-day ROC is positive and accelerating (10-day vs 20-day)
     is_positive = roc_20 > 0 and roc_10 > (roc_20 / 2)
     
-    return {
+    return bool(is_positive), {
         'name': 'Price ROC',
         'value': f'20d: {roc_20:+.2f}%, 10d: {roc_10:+.2f}%',
         'status': 'Positive' if is_positive else 'Negative',
@@ -198,6 +217,174 @@ def calculate_price_roc(spy_data):
     }
 
 
+def _column(df, col):
+    """Returns a column as a contiguous float64 array."""
+    return np.ascontiguousarray(df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def _rolling(values, window, reducer):
+    """
+    Trailing rolling reduction over a 1-D array using zero-copy window views.
+    
+    Matches pandas rolling semantics: the first `window - 1` entries, and any
+    window containing NaN, are NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = reducer(sliding_window_view(values, window), axis=1)
+    return out
+
+
+def _pct_change(close, bars):
+    """Percent change between each close and the close `bars - 1` rows earlier."""
+    out = np.full(len(close), np.nan)
+    lag = bars - 1
+    if len(close) > lag:
+        out[lag:] = (close[lag:] / close[:-lag] - 1) * 100
+    return out
+
+
+def _tail(values, window, reducer):
+    """Reduces only the last `window` values; NaN when the series is too short."""
+    if len(values) < window:
+        return np.nan
+    return reducer(values[-window:])
+
+
+def _tail_pct_change(close, bars):
+    """Latest value of _pct_change without building the full series."""
+    if len(close) < bars:
+        return np.nan
+    return (close[-1] / close[-bars] - 1) * 100
+
+
+def compute_latest_metric_inputs(spy_data, iwm_data, tlt_data, vix_data):
+    """
+    Computes the metric inputs for the latest day only, from tail slices.
+    
+    Returns the same keys as compute_metric_inputs, each holding a
+    single-element array so calculate_metrics_at(inputs, -1) applies.
+    
+    Returns:
+        dict of metric input name -> np.ndarray of length 1
+    """
+    spy_close = _column(spy_data, 'Close')
+    spy_volume = _column(spy_data, 'Volume')
+    vix_close = _column(vix_data, 'Close')
+    
+    latest = {
+        'spy_close': spy_close[-1],
+        'spy_volume': spy_volume[-1],
+        'vol_avg5': _tail(spy_volume, 5, np.mean),
+        'vol_avg20': _tail(spy_volume, 20, np.mean),
+        'vol_avg50': _tail(spy_volume, 50, np.mean),
+        'high20': _tail(_column(spy_data, 'High'), 20, np.max),
+        'spy_roc20': _tail_pct_change(spy_close, 20),
+        'spy_roc10': _tail_pct_change(spy_close, 10),
+        'iwm_roc20': _tail_pct_change(_column(iwm_data, 'Close'), 20),
+        'tlt_roc10': _tail_pct_change(_column(tlt_data, 'Close'), 10),
+        'vix_close': vix_close[-1],
+        'vix_avg20': _tail(vix_close, 20, np.mean)
+    }
+    return {name: np.array([value], dtype=np.float64) for name, value in latest.items()}
+
+
+def compute_metric_inputs(spy_data, iwm_data, tlt_data, vix_data):
+    """
+    Precomputes every rolling window used by the six metrics over the full series.
+    
+    Each entry is a NumPy array aligned positionally with its source frame, so
+    a single day's inputs are a plain index lookup.
+    
+    Returns:
+        dict of metric input name -> np.ndarray
+    """
+    spy_close = _column(spy_data, 'Close')
+    spy_volume = _column(spy_data, 'Volume')
+    vix_close = _column(vix_data, 'Close')
+    
+    return {
+        'spy_close': spy_close,
+        'spy_volume': spy_volume,
+        'vol_avg5': _rolling(spy_volume, 5, np.mean),
+        'vol_avg20': _rolling(spy_volume, 20, np.mean),
+        'vol_avg50': _rolling(spy_volume, 50, np.mean),
+        'high20': _rolling(_column(spy_data, 'High'), 20, np.max),
+        'spy_roc20': _pct_change(spy_close, 20),
+        'spy_roc10': _pct_change(spy_close, 10),
+        'iwm_roc20': _pct_change(_column(iwm_data, 'Close'), 20),
+        'tlt_roc10': _pct_change(_column(tlt_data, 'Close'), 10),
+        'vix_close': vix_close,
+        'vix_avg20': _rolling(vix_close, 20, np.mean)
+    }
+
+
+def calculate_metrics_at(inputs, i):
+    """
+    Calculates all six metrics for one day from precomputed inputs.
+    
+    Args:
+        inputs: dict from compute_metric_inputs
+        i: Positional day index (negative indexes count from the end)
+        
+    Returns:
+        list of 6 (is_positive, metric dict) tuples
+    """
+    return [
+        calculate_market_breadth(inputs['spy_volume'][i], inputs['vol_avg20'][i],
+                                 inputs['spy_close'][i], inputs['high20'][i]),
+        calculate_volume_strength(inputs['vol_avg5'][i], inputs['vol_avg50'][i]),
+        calculate_relative_performance(inputs['spy_roc20'][i], inputs['iwm_roc20'][i]),
+        calculate_asset_flows(inputs['spy_roc10'][i], inputs['tlt_roc10'][i]),
+        calculate_volatility(inputs['vix_close'][i], inputs['vix_avg20'][i]),
+        calculate_price_roc(inputs['spy_roc20'][i], inputs['spy_roc10'][i])
+    ]
+
+
+def compute_metric_flags(inputs):
+    """
+    Vectorized positive/negative status of all six metrics for every day.
+    
+    Applies the same thresholds as the calculate_* functions, column-wise.
+    Missing data (NaN) compares as False and therefore counts as Negative.
+    
+    Args:
+        inputs: dict from compute_metric_inputs, all arrays of equal length
+        
+    Returns:
+        np.ndarray of shape (6, n_days) with True where the metric is Positive
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = inputs['spy_volume'] / inputs['vol_avg20']
+        price_ratio = inputs['spy_close'] / inputs['high20']
+        recent_volume_ratio = inputs['vol_avg5'] / inputs['vol_avg50']
+    
+    roc_20 = inputs['spy_roc20']
+    roc_10 = inputs['spy_roc10']
+    vix = inputs['vix_close']
+    
+    return np.vstack([
+        (volume_ratio > 1.0) & (price_ratio > 0.98),           # Market Breadth
+        recent_volume_ratio > 1.10,                            # Volume
+        inputs['iwm_roc20'] - roc_20 > 0,                      # Relative Performance
+        roc_10 > inputs['tlt_roc10'],                          # Asset Flows
+        (vix < 20) & (vix < inputs['vix_avg20']),              # Volatility (VIX)
+        (roc_20 > 0) & (roc_10 > roc_20 / 2)                   # Price ROC
+    ])
+
+
+def _signals_error(message):
+    """Error-state result for get_asbury_6_signals."""
+    return {
+        'error': message,
+        'metrics': [],
+        'signal': 'ERROR',
+        'positive_count': 0,
+        'negative_count': 0,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
 def get_asbury_6_signals():
     """
     Main orchestrator function that fetches all required market data 
@@ -220,29 +407,22 @@ def get_asbury_6_signals():
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        spy_data = fetch_ticker_data('SPY', start_str, end_str)
-        iwm_data = fetch_ticker_data('IWM', start_str, end_str)
-        tlt_data = fetch_ticker_data('TLT', start_str, end_str)
-        vix_data = fetch_ticker_data('^VIX', start_str, end_str)
+        spy_data, iwm_data, tlt_data, vix_data = fetch_basket_data(start_str, end_str)
         
-        # Flatten MultiIndex columns if present
-        for df in [spy_data, iwm_data, tlt_data, vix_data]:
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
+        # Validate once up front so the kernels can assume full windows
+        min_len = min(len(df) for df in (spy_data, iwm_data, tlt_data, vix_data))
+        if min_len < MIN_BARS:
+            return _signals_error(f'Insufficient data: need {MIN_BARS} bars, got {min_len}')
         
-        # Calculate all six metrics
-        metrics = [
-            calculate_market_breadth(spy_data),
-            calculate_volume_strength(spy_data),
-            calculate_relative_performance(spy_data, iwm_data),
-            calculate_asset_flows(spy_data, tlt_data),
-            calculate_volatility(vix_data),
-            calculate_price_roc(spy_data)
-        ]
+        # Calculate all six metrics for the latest day
+        inputs = compute_latest_metric_inputs(spy_data, iwm_data, tlt_data, vix_data)
+        results = calculate_metrics_at(inputs, -1)
+        metrics = [metric for _, metric in results]
         
-        # Count positive and negative signals
-        positive_count = sum(1 for m in metrics if m['status'] == 'Positive')
-        negative_count = sum(1 for m in metrics if m['status'] == 'Negative')
+        # Pack the six statuses into a bitmask and count the set bits
+        mask = sum(1 << i for i, (is_positive, _) in enumerate(results) if is_positive)
+        positive_count = mask.bit_count()
+        negative_count = len(results) - positive_count
         
         # Determine overall signal
         if positive_count >= 4:
@@ -262,14 +442,7 @@ def get_asbury_6_signals():
     
     except Exception as e:
         # Return error state
-        return {
-            'error': str(e),
-            'metrics': [],
-            'signal': 'ERROR',
-            'positive_count': 0,
-            'negative_count': 0,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        return _signals_error(str(e))
 
 
 def get_asbury_6_historical(days=90):
@@ -291,64 +464,38 @@ def get_asbury_6_historical(days=90):
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        spy_data = fetch_ticker_data('SPY', start_str, end_str)
-        iwm_data = fetch_ticker_data('IWM', start_str, end_str)
-        tlt_data = fetch_ticker_data('TLT', start_str, end_str)
-        vix_data = fetch_ticker_data('^VIX', start_str, end_str)
+        spy_data, iwm_data, tlt_data, vix_data = fetch_basket_data(start_str, end_str)
         
-        # Flatten MultiIndex columns if present
-        for df in [spy_data, iwm_data, tlt_data, vix_data]:
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
+        # Compute rolling windows once over the full series
+        inputs = compute_metric_inputs(spy_data, iwm_data, tlt_data, vix_data)
         
-        # Calculate signals for each day
-        history = []
+        # Only days present in every series can be scored
+        n_days = min(len(values) for values in inputs.values())
+        inputs = {name: values[:n_days] for name, values in inputs.items()}
         
         # Start from a point where we have enough data for all calculations
         start_idx = 60
         
-        for i in range(start_idx, len(spy_data)):
-            date = spy_data.index[i]
-            
-            # Get subset of data up to this date for calculations
-            spy_subset = spy_data.iloc[:i+1]
-            iwm_subset = iwm_data.iloc[:i+1]
-            tlt_subset = tlt_data.iloc[:i+1]
-            vix_subset = vix_data.iloc[:i+1]
-            
-            # Calculate each metric
-            try:
-                metrics = [
-                    calculate_market_breadth(spy_subset),
-                    calculate_volume_strength(spy_subset),
-                    calculate_relative_performance(spy_subset, iwm_subset),
-                    calculate_asset_flows(spy_subset, tlt_subset),
-                    calculate_volatility(vix_subset),
-                    calculate_price_roc(spy_subset)
-                ]
-                
-                positive_count = sum(1 for m in metrics if m['status'] == 'Positive')
-                negative_count = sum(1 for m in metrics if m['status'] == 'Negative')
-                
-                if positive_count >= 4:
-                    signal = 'BUY'
-                elif negative_count >= 4:
-                    signal = 'CASH'
-                else:
-                    signal = 'NEUTRAL'
-                
-                history.append({
-                    'Date': date,
-                    'Positive_Count': positive_count,
-                    'Negative_Count': negative_count,
-                    'Signal': signal,
-                    'SPY_Close': spy_subset['Close'].iloc[-1]
-                })
-            except Exception as e:
-                logger.info(f"Error calculating historical A6 on {date.date()}: {e}")
-                continue
+        # Score every day at once: one boolean row per metric
+        flags = compute_metric_flags(inputs)[:, start_idx:]
+        positive_count = flags.sum(axis=0, dtype=np.int8)
+        negative_count = np.int8(len(flags)) - positive_count
+        
+        # Encode as int8 signal codes, decoded to labels in a single lookup
+        signal_code = np.select(
+            [positive_count >= 4, negative_count >= 4],
+            [1, 2],
+            default=0
+        ).astype(np.int8)
+        signal = SIGNAL_LABELS[signal_code]
         
-        return pd.DataFrame(history)
+        return pd.DataFrame({
+            'Date': spy_data.index[start_idx:n_days],
+            'Positive_Count': positive_count,
+            'Negative_Count': negative_count,
+            'Signal': signal,
+            'SPY_Close': inputs['spy_close'][start_idx:]
+        })
     
     except Exception as e:
         return pd.DataFrame()
@@ -1,9 +1,9 @@
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import datetime
 import streamlit as st
+from services.data_fetcher import fetch_stock_info, fetch_stock_history
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -13,8 +13,9 @@ def get_canslim_metrics(ticker):
     Computes metrics for William O'Neil's CANSLIM Strategy.
     """
     try:
-        t = yf.Ticker(ticker)
-        info = t.info
+        info = fetch_stock_info(ticker)
+        if not info:
+            return None
         
         # --- C: Current Quarterly Earnings (EPS > 25% Growth) ---
         # yfinance often lacks quarterly history easily, use 'earningsQuarterlyGrowth'
@@ -51,7 +52,7 @@ def get_canslim_metrics(ticker):
         l_score = False
         try:
              # Fetch 1y Data
-            hist = t.history(period="1y")
+            hist = fetch_stock_history(ticker, period="1y")
             if not hist.empty:
                 ret_1y = (hist['Close'].iloc[-1] / hist['Close'].iloc[0]) - 1
                 # Benchmark (Static 10% assumption or fetch SPY)
@@ -7,6 +7,7 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
+from services.cache import disk_cache
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -14,6 +15,23 @@ logger = setup_logger(__name__)
 BASE_URL = "https://api.congress.gov/v3"
 
 
+@st.cache_resource
+def get_congress_session():
+    """
+    Shared HTTP session for Congress.gov.
+
+    Held in st.cache_resource so its keep-alive connection (and TLS
+    handshake) is reused across reruns and sessions.
+    """
+    session = requests.Session()
+    # Add basic UA to avoid weak bot blocks
+    session.headers.update({
+        'User-Agent': 'Streamlit-Stock-Analysis-App/1.0',
+        'Accept': 'application/json'
+    })
+    return session
+
+
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_congress_members(api_key=None):
     """Fetch current Congress members."""
@@ -25,6 +43,17 @@ def fetch_congress_members(api_key=None):
         # Graceful fallback or warning if key is missing
         return pd.DataFrame()
 
+    return _download_congress_members(api_key=api_key)
+
+
+@disk_cache(ttl=3600*24)  # The member roster rarely changes; persist for a day
+def _download_congress_members(*, api_key):
+    """
+    Downloads the current member roster from Congress.gov.
+
+    The key is keyword-only so the disk cache files it under the shared
+    folder by digest; it never appears in a cache path.
+    """
     try:
         url = f"{BASE_URL}/member"
         params = {
@@ -33,10 +62,7 @@ def fetch_congress_members(api_key=None):
             "currentMember": "true",
             "format": "json"
         }
-        # Add basic UA to avoid weak bot blocks
-        headers = {'User-Agent': 'Streamlit-Stock-Analysis-App/1.0'}
-        
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = get_congress_session().get(url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
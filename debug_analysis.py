@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add current directory to path
 sys.path.append(os.getcwd())
@@ -14,10 +15,16 @@ from canslim import get_canslim_metrics
 def test_analysis_modules(ticker="AAPL"):
     print(f"🔬 Testing Analysis Modules for {ticker}...")
     
+    # The three analyses are independent network-bound calls; run them together
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        fut_pg = executor.submit(calculate_power_gauge, ticker)
+        fut_w = executor.submit(get_weinstein_stage, ticker)
+        fut_c = executor.submit(get_canslim_metrics, ticker)
+    
     # 1. Power Gauge
     print("\n⚡ Testing Power Gauge...")
     try:
-        pg = calculate_power_gauge(ticker)
+        pg = fut_pg.result()
         if pg:
             print(f"✅ Power Gauge Success: Rating={pg['rating']}, Score={pg['score']:.2f}")
         else:
@@ -28,7 +35,7 @@ def test_analysis_modules(ticker="AAPL"):
     # 2. Weinstein Stage
     print("\n📉 Testing Weinstein Stage...")
     try:
-        w = get_weinstein_stage(ticker)
+        w = fut_w.result()
         if w:
             print(f"✅ Weinstein Success: Stage={w['stage']}")
         else:
@@ -39,7 +46,7 @@ def test_analysis_modules(ticker="AAPL"):
     # 3. CANSLIM
     print("\n🚀 Testing CANSLIM...")
     try:
-        c = get_canslim_metrics(ticker)
+        c = fut_c.result()
         if c:
             print(f"✅ CANSLIM Success: Score={c['score']}/7")
         else:
@@ -3,9 +3,9 @@ Fundamental Analysis Module (Inspired by ROIC.ai)
 Fetches key fundamental quality and valuation metrics.
 """
 
-import yfinance as yf
 import pandas as pd
 import streamlit as st
+from services.data_fetcher import fetch_stock_info
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -13,8 +13,9 @@ logger = setup_logger(__name__)
 def fetch_fundamental_data(ticker):
     """Fetch key fundamental metrics for a ticker."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = fetch_stock_info(ticker)
+        if not info:
+            return None
         
         # Extract key metrics with safe defaults
         metrics = {
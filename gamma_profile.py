@@ -8,9 +8,13 @@ import numpy as np
 import yfinance as yf
 from datetime import datetime
 import streamlit as st
+from services.data_fetcher import downcast_columns, fetch_chains_concurrently, fetch_stock_info
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
+# Option side encoding: +1 for calls, -1 for puts
+SIDE_LABELS = {1: 'call', -1: 'put'}
+
 
 @st.cache_data(ttl=300)  # Cache for 5 minutes (options data changes frequently)
 def get_cached_options_chain(symbol, max_expirations=10):
@@ -21,28 +25,29 @@ def get_cached_options_chain(symbol, max_expirations=10):
         if not expirations:
             return None
         
+        # yfinance builds fresh frames per request, so tag them in place
         all_chains = []
-        for exp_date in expirations[:max_expirations]:
-            try:
-                chain = ticker.option_chain(exp_date)
-                calls = chain.calls.copy()
-                calls['option_type'] = 'call'
-                calls['expiration'] = exp_date
-                puts = chain.puts.copy()
-                puts['option_type'] = 'put'
-                puts['expiration'] = exp_date
-                all_chains.append(calls)
-                all_chains.append(puts)
-            except Exception:
-                continue
+        for calls, puts, exp_date in fetch_chains_concurrently(ticker, expirations[:max_expirations]):
+            calls['side'] = np.int8(1)
+            calls['expiration'] = exp_date
+            puts['side'] = np.int8(-1)
+            puts['expiration'] = exp_date
+            all_chains.append(calls)
+            all_chains.append(puts)
         
         if not all_chains:
             return None
         
         df = pd.concat(all_chains, ignore_index=True)
-        current_price = ticker.info.get('currentPrice') or ticker.info.get('regularMarketPrice')
+        info = fetch_stock_info(symbol)
+        current_price = info.get('currentPrice') or info.get('regularMarketPrice')
         df['underlying_price'] = current_price if current_price else (df['bid'] + df['ask']) / 2
-        return df
+        # Strike stays float64: it becomes the GEX index and the key for the wall/flip levels
+        return downcast_columns(
+            df,
+            float_cols=('lastPrice', 'bid', 'ask', 'change', 'percentChange', 'impliedVolatility'),
+            int_cols=('volume', 'openInterest')
+        )
     except Exception:
         return None
 
@@ -66,27 +71,20 @@ def fetch_options_chain(symbol, max_expirations=10):
         if not expirations:
             return None
         
-        # Fetch chains and combine
+        # Fetch chains concurrently and combine; yfinance builds fresh
+        # frames per request, so they are tagged in place without copying
         all_chains = []
-        for exp_date in expirations[:max_expirations]:
-            try:
-                chain = ticker.option_chain(exp_date)
-                
-                # Process calls
-                calls = chain.calls.copy()
-                calls['option_type'] = 'call'
-                calls['expiration'] = exp_date
-                
-                # Process puts
-                puts = chain.puts.copy()
-                puts['option_type'] = 'put'
-                puts['expiration'] = exp_date
-                
-                all_chains.append(calls)
-                all_chains.append(puts)
-                
-            except Exception:
-                continue
+        for calls, puts, exp_date in fetch_chains_concurrently(ticker, expirations[:max_expirations]):
+            # Process calls
+            calls['side'] = np.int8(1)
+            calls['expiration'] = exp_date
+            
+            # Process puts
+            puts['side'] = np.int8(-1)
+            puts['expiration'] = exp_date
+            
+            all_chains.append(calls)
+            all_chains.append(puts)
         
         if not all_chains:
             return None
@@ -95,7 +93,8 @@ def fetch_options_chain(symbol, max_expirations=10):
         df = pd.concat(all_chains, ignore_index=True)
         
         # Get current price
-        current_price = ticker.info.get('currentPrice') or ticker.info.get('regularMarketPrice')
+        info = fetch_stock_info(symbol)
+        current_price = info.get('currentPrice') or info.get('regularMarketPrice')
         if current_price:
             df['underlying_price'] = current_price
         else:
@@ -120,17 +119,82 @@ def approximate_gamma(df):
     Returns:
         Series with approximated gamma values
     """
-    S = df['underlying_price']
-    K = df['strike']
+    gamma = approximate_gamma_values(df['strike'].to_numpy(), df['underlying_price'].to_numpy())
+    return pd.Series(gamma, index=df.index)
+
+
+def approximate_gamma_values(K, S):
+    """
+    Array version of approximate_gamma.
     
-    # Moneyness (how far from ATM)
-    moneyness = np.abs(K - S) / S
+    Args:
+        K: np.ndarray of strikes
+        S: np.ndarray (or scalar) of underlying prices
+        
+    Returns:
+        np.ndarray with approximated gamma values
+    """
+    # Moneyness (how far from ATM); float32 is ample for a heuristic and
+    # the ops run in place on one buffer instead of allocating temporaries
+    S = np.asarray(S, dtype=np.float32)
+    moneyness = np.subtract(np.asarray(K, dtype=np.float32), S)
+    moneyness /= S
     
     # Gamma approximation: peaks at ATM, decays exponentially
     # Scale factor chosen for reasonable GEX values
-    gamma = 0.01 * np.exp(-50 * moneyness**2)
+    np.square(moneyness, out=moneyness)
+    moneyness *= -50
+    np.exp(moneyness, out=moneyness)
+    moneyness *= 0.01
+    return moneyness
+
+
+def _column_values(df, col):
+    """Returns a column as a float64 array with missing values filled with 0."""
+    return np.nan_to_num(df[col].to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+
+
+def aggregate_by_strike(strike, signed_gex, volume, side):
+    """
+    Sums GEX and call/put volume per strike.
     
-    return gamma
+    Strikes sit on a small grid, so sorting once and reducing over the runs
+    of equal strikes is cheaper than hashing float keys in a groupby.
+    
+    Args:
+        strike: np.ndarray of strikes
+        signed_gex: np.ndarray of signed gamma exposure per contract
+        volume: np.ndarray of volume per contract
+        side: np.ndarray of int8 sides (+1 call, -1 put)
+        
+    Returns:
+        Tuple of (gex_by_strike Series, vol_by_strike DataFrame), sorted by strike
+    """
+    order = np.argsort(strike, kind='stable')
+    s_sorted = strike[order]
+    
+    # Mark the first row of each run of equal strikes
+    is_start = np.empty(len(s_sorted), dtype=bool)
+    is_start[:1] = True
+    is_start[1:] = s_sorted[1:] != s_sorted[:-1]
+    starts = np.flatnonzero(is_start)
+    
+    strike_index = pd.Index(s_sorted[starts], name='strike')
+    gex_by_strike = pd.Series(np.add.reduceat(signed_gex[order], starts), index=strike_index)
+    
+    # Dense strike ids let bincount split volume by side in one pass each
+    strike_id = np.cumsum(is_start) - 1
+    v_sorted = volume[order]
+    side_sorted = side[order]
+    vol_columns = {}
+    for s, label in SIDE_LABELS.items():
+        mask = side_sorted == s
+        if mask.any():
+            vol_columns[label] = np.bincount(strike_id, weights=v_sorted * mask, minlength=len(starts))
+    vol_by_strike = pd.DataFrame(vol_columns, index=strike_index)
+    vol_by_strike.columns.name = 'option_type'
+    
+    return gex_by_strike, vol_by_strike
 
 
 def calculate_gamma_exposure(df):
@@ -147,26 +211,35 @@ def calculate_gamma_exposure(df):
     Returns:
         Tuple of (gex_by_strike, volume_by_strike, spot_price, stats_dict)
     """
-    # Map yfinance column names
-    column_mapping = {
-        'openInterest': 'open_interest',
-        'impliedVolatility': 'implied_volatility'
-    }
-    df = df.rename(columns=column_mapping)
+    # Accept both the yfinance column name and the normalized one
+    oi_col = 'openInterest' if 'openInterest' in df.columns else 'open_interest'
     
     # Check required columns
-    required = ['strike', 'option_type', 'open_interest', 'volume', 'underlying_price']
+    required = ['strike', oi_col, 'volume', 'underlying_price']
     if not all(c in df.columns for c in required):
         return None
     
-    # Add gamma if not present
-    if 'gamma' not in df.columns:
-        df['gamma'] = approximate_gamma(df)
+    # Side is +1 for calls and -1 for puts; derive it from option_type if absent
+    if 'side' in df.columns:
+        side = df['side'].to_numpy(dtype=np.int8)
+    elif 'option_type' in df.columns:
+        side = np.where(df['option_type'].to_numpy() == 'call', 1, -1).astype(np.int8)
+    else:
+        return None
     
-    # Fill NAs
-    df['gamma'] = df['gamma'].fillna(0)
-    df['open_interest'] = df['open_interest'].fillna(0)
-    df['volume'] = df['volume'].fillna(0)
+    # Work on plain NumPy arrays; the input frame is left untouched
+    strike = df['strike'].to_numpy(dtype=np.float64)
+    open_interest = _column_values(df, oi_col)
+    volume = _column_values(df, 'volume')
+    
+    # Use provided gamma if present, otherwise approximate it
+    if 'gamma' in df.columns:
+        gamma = _column_values(df, 'gamma')
+    else:
+        gamma = np.nan_to_num(
+            approximate_gamma_values(strike, df['underlying_price'].to_numpy(dtype=np.float64)),
+            nan=0.0
+        )
     
     # Get spot price
     spot_price = df['underlying_price'].iloc[0]
@@ -174,30 +247,20 @@ def calculate_gamma_exposure(df):
     # Calculate GEX
     # GEX = Gamma * OI * 100 * Spot
     # Calls are positive (dealer long gamma), Puts are negative (dealer short gamma)
-    df['gex'] = df['gamma'] * df['open_interest'] * 100 * spot_price
-    
-    # Apply sign based on option type
-    df['signed_gex'] = df.apply(
-        lambda x: x['gex'] if x['option_type'] == 'call' else -x['gex'], 
-        axis=1
-    )
+    signed_gex = gamma * open_interest * side * (100 * spot_price)
     
     # Aggregate by strike
-    gex_by_strike = df.groupby('strike')['signed_gex'].sum().sort_index()
-    vol_by_strike = df.groupby(['strike', 'option_type'])['volume'].sum().unstack(fill_value=0).sort_index()
+    gex_by_strike, vol_by_strike = aggregate_by_strike(strike, signed_gex, volume, side)
     
-    # Filter for relevant range (+/- 20% of spot)
+    # Filter for relevant range (+/- 20% of spot); strikes are already sorted
     lower_bound = spot_price * 0.8
     upper_bound = spot_price * 1.2
     
-    gex_filtered = gex_by_strike[
-        (gex_by_strike.index >= lower_bound) & 
-        (gex_by_strike.index <= upper_bound)
-    ]
-    vol_filtered = vol_by_strike[
-        (vol_by_strike.index >= lower_bound) & 
-        (vol_by_strike.index <= upper_bound)
-    ]
+    strikes = gex_by_strike.index.to_numpy()
+    lo = np.searchsorted(strikes, lower_bound, side='left')
+    hi = np.searchsorted(strikes, upper_bound, side='right')
+    gex_filtered = gex_by_strike.iloc[lo:hi]
+    vol_filtered = vol_by_strike.iloc[lo:hi]
     
     # Calculate key statistics
     max_gex_strike = gex_filtered.idxmax() if len(gex_filtered) > 0 else None
@@ -208,11 +271,9 @@ def calculate_gamma_exposure(df):
     # Find zero-gamma level (where GEX crosses zero)
     zero_gamma_level = None
     if len(gex_filtered) > 0:
-        # Find the strike closest to where GEX = 0
-        gex_cumsum = gex_filtered.sort_index().cumsum()
-        zero_cross = gex_cumsum[gex_cumsum.abs() == gex_cumsum.abs().min()]
-        if len(zero_cross) > 0:
-            zero_gamma_level = zero_cross.index[0]
+        # Find the strike closest to where cumulative GEX = 0
+        gex_cumsum = np.cumsum(gex_filtered.to_numpy())
+        zero_gamma_level = gex_filtered.index[np.argmin(np.abs(gex_cumsum))]
     
     stats = {
         'spot_price': spot_price,
@@ -3,13 +3,15 @@ Macro & Intermarket Analysis Module
 Analyzes yields, commodities, and currencies to determine broader market context.
 """
 
-import yfinance as yf
+# plotly and yfinance are imported inside the functions that use them, so
+# loading this module on app start does not pay for them
+import requests
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import streamlit as st
+from services.cache import disk_cache
+from services.downsample import downsample_series
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -25,11 +27,74 @@ MACRO_TICKERS = {
     'SP500': '^GSPC'
 }
 
+# Yahoo spark endpoint: daily closes for up to 20 symbols per request
+SPARK_URL = 'https://query1.finance.yahoo.com/v8/finance/spark'
+SPARK_MAX_SYMBOLS = 20
+
+
+def _spark_results(payload):
+    """Yields (symbol, timestamps, closes, timezone) from either spark response shape."""
+    if 'spark' in payload:
+        for result in payload['spark'].get('result') or []:
+            response = (result.get('response') or [{}])[0]
+            quote = (response.get('indicators', {}).get('quote') or [{}])[0]
+            timezone = response.get('meta', {}).get('exchangeTimezoneName')
+            yield result.get('symbol'), response.get('timestamp'), quote.get('close'), timezone
+    else:
+        for symbol, result in payload.items():
+            yield symbol, result.get('timestamp'), result.get('close'), None
+
+
+def fetch_spark_closes(tickers, period="1y"):
+    """
+    Fetches daily closes for several tickers through Yahoo's spark endpoint.
+    
+    One request covers up to 20 symbols, versus one request per ticker for
+    yf.download.
+    
+    Returns:
+        DataFrame with ('Close', ticker) MultiIndex columns, like yf.download
+    """
+    closes = {}
+    for i in range(0, len(tickers), SPARK_MAX_SYMBOLS):
+        batch = tickers[i:i + SPARK_MAX_SYMBOLS]
+        response = requests.get(
+            SPARK_URL,
+            params={'symbols': ','.join(batch), 'range': period, 'interval': '1d'},
+            headers={'User-Agent': 'Mozilla/5.0'},
+            timeout=10
+        )
+        response.raise_for_status()
+        
+        for symbol, timestamps, values, timezone in _spark_results(response.json()):
+            if not symbol or not timestamps or not values:
+                continue
+            dates = pd.to_datetime(timestamps, unit='s', utc=True)
+            dates = dates.tz_convert(timezone or 'America/New_York').tz_localize(None).normalize()
+            series = pd.Series(values, index=dates, dtype=float)
+            closes[symbol] = series[~series.index.duplicated(keep='last')]
+    
+    missing = [t for t in tickers if t not in closes]
+    if missing:
+        raise ValueError(f"Spark response missing {missing}")
+    
+    return pd.concat({'Close': pd.DataFrame(closes)[tickers]}, axis=1).sort_index()
+
+
 @st.cache_data(ttl=3600)  # Cache for 1 hour
+@disk_cache(ttl=3600)  # Same TTL, but survives app restarts
 def fetch_macro_data(period="1y"):
     """Fetch historical data for all macro indicators."""
     try:
         tickers = list(MACRO_TICKERS.values())
+        
+        # Fast path: one batched spark request; fall back to yf.download
+        try:
+            return fetch_spark_closes(tickers, period)
+        except Exception as e:
+            logger.info(f"Spark fetch failed, falling back to yf.download: {e}")
+        
+        import yfinance as yf
         data = yf.download(tickers, period=period, progress=False)
         
         # Flatten MultiIndex if present
@@ -44,13 +109,29 @@ def fetch_macro_data(period="1y"):
         return pd.DataFrame()
 
 
+def _closes_view(data):
+    """
+    Extracts the close column of every macro ticker once.
+    
+    Returns:
+        Tuple of (DatetimeIndex, dict of ticker -> np.ndarray of closes)
+    """
+    closes = data['Close']
+    # One set of column labels instead of a MultiIndex containment test per ticker
+    available = set(closes.columns)
+    return closes.index, {
+        ticker: closes[ticker].to_numpy(dtype=np.float64)
+        for ticker in MACRO_TICKERS.values() if ticker in available
+    }
+
+
 def get_yield_curve_data(data):
     """Extract and calculate yield curve metrics."""
     if data.empty:
         return None
         
     try:
-        closes = data['Close']
+        index, closes = _closes_view(data)
         
         # Calculate Spread (10Y - 3M)
         # Note: Yahoo data for TNX/FVX/IRX is usually in percentage points (e.g. 4.12)
@@ -59,13 +140,11 @@ def get_yield_curve_data(data):
         
         spread = (ten_year - three_month) * 100 # Convert to bps
         
-        df = pd.DataFrame({
+        return pd.DataFrame({
             '10Y': ten_year,
             '3M': three_month,
             'Spread': spread
-        })
-        
-        return df
+        }, index=index)
     except KeyError as e:
         logger.info(f"Missing yield data: {e}")
         return None
@@ -77,7 +156,7 @@ def get_asset_performance(data):
         return None
         
     try:
-        closes = data['Close']
+        index, closes = _closes_view(data)
         
         assets = {
             'Stocks (SPX)': MACRO_TICKERS['SP500'],
@@ -87,16 +166,15 @@ def get_asset_performance(data):
             'Bitcoin': MACRO_TICKERS['Bitcoin']
         }
         
-        perf_df = pd.DataFrame()
+        cols_keep = [(name, ticker) for name, ticker in assets.items() if ticker in closes]
+        if not cols_keep:
+            return pd.DataFrame()
+        subset = np.column_stack([closes[ticker] for _, ticker in cols_keep])
+        
+        # Normalize every asset to 0% start in one array-wide operation
+        perf = (subset / subset[0] - 1) * 100
         
-        for name, ticker in assets.items():
-            if ticker in closes:
-                # Normalize to 0% start
-                series = closes[ticker]
-                normalized = ((series / series.iloc[0]) - 1) * 100
-                perf_df[name] = normalized
-                
-        return perf_df
+        return pd.DataFrame(perf, index=index, columns=[name for name, _ in cols_keep])
     except Exception as e:
         logger.info(f"Error calculating performance: {e}")
         return None
@@ -106,23 +184,29 @@ def render_yield_curve_chart(yield_df):
     """Create yield curve visualization."""
     if yield_df is None:
         return None
+    
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
         
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
                         vertical_spacing=0.08, row_heights=[0.6, 0.4],
                         subplot_titles=("Treasury Yields", "10Y-3M Spread (Recession Indicator)"))
     
-    # Yields
-    fig.add_trace(go.Scatter(x=yield_df.index, y=yield_df['10Y'], name="10Y Yield", 
+    # Yields (WebGL lines, LTTB-downsampled for long periods)
+    ten_year = downsample_series(yield_df['10Y'])
+    three_month = downsample_series(yield_df['3M'])
+    fig.add_trace(go.Scattergl(x=ten_year.index, y=ten_year, name="10Y Yield", 
                             line=dict(color='#3b82f6', width=2)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=yield_df.index, y=yield_df['3M'], name="3M Yield", 
+    fig.add_trace(go.Scattergl(x=three_month.index, y=three_month, name="3M Yield", 
                             line=dict(color='#fbbf24', width=2)), row=1, col=1)
     
     # Spread (Bar Chart for cleaner positive/negative distinction)
-    colors = ['#4ade80' if val >= 0 else '#ef4444' for val in yield_df['Spread']]
+    spread = downsample_series(yield_df['Spread'])
+    colors = np.where(spread.to_numpy() >= 0, '#4ade80', '#ef4444')
     
     fig.add_trace(go.Bar(
-        x=yield_df.index, 
-        y=yield_df['Spread'], 
+        x=spread.index, 
+        y=spread, 
         name="Spread",
         marker_color=colors,
         marker_line_width=0
@@ -148,6 +232,8 @@ def render_intermarket_chart(perf_df):
     """Create intermarket performance comparison chart."""
     if perf_df is None:
         return None
+    
+    import plotly.graph_objects as go
         
     fig = go.Figure()
     
@@ -160,9 +246,10 @@ def render_intermarket_chart(perf_df):
     }
     
     for col in perf_df.columns:
-        fig.add_trace(go.Scatter(
-            x=perf_df.index, 
-            y=perf_df[col], 
+        series = downsample_series(perf_df[col])
+        fig.add_trace(go.Scattergl(
+            x=series.index, 
+            y=series, 
             name=col,
             line=dict(color=colors.get(col, 'white'))
         ))
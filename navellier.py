@@ -2,6 +2,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import streamlit as st
+from services.data_fetcher import fetch_stock_info
 from services.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -155,9 +156,8 @@ def calculate_navellier_grader(ticker):
     Calculates the Louis Navellier Portfolio Grader scores.
     """
     try:
-        t = yf.Ticker(ticker)
-        info = t.info
-        history = t.history(period="6mo")
+        info = fetch_stock_info(ticker)
+        history = yf.Ticker(ticker).history(period="6mo")
         
         fund_grade = calculate_fundamental_grade(info)
         quant_grade = calculate_quantitative_grade(history)
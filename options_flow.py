@@ -8,11 +8,17 @@ import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
 import streamlit as st
+from services.cache import disk_cache
+from services.data_fetcher import downcast_columns, fetch_chains_concurrently, fetch_stock_info
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
+# Chain columns the flow pipeline reads; the rest are dropped at fetch time
+FLOW_COLUMNS = ['strike', 'lastPrice', 'bid', 'ask', 'volume', 'openInterest']
+
 
 @st.cache_data(ttl=300)  # Cache for 5 minutes
+@disk_cache(ttl=300)  # Same TTL, but survives app restarts
 def fetch_flow_data(symbol):
     """Cached fetching of options chain for flow analysis."""
     try:
@@ -22,7 +28,7 @@ def fetch_flow_data(symbol):
         if not expirations:
             return None, None, None
         
-        stock_info = ticker.info
+        stock_info = fetch_stock_info(symbol)
         current_price = stock_info.get('currentPrice') or stock_info.get('regularMarketPrice')
         
         target_date = datetime.now() + timedelta(days=90)
@@ -31,24 +37,29 @@ def fetch_flow_data(symbol):
         all_calls = []
         all_puts = []
         
-        for exp_date in relevant_exps[:10]:
-            try:
-                chain = ticker.option_chain(exp_date)
-                calls = chain.calls.copy()
-                calls['expiration'] = exp_date
-                calls['option_type'] = 'call'
-                all_calls.append(calls)
-                
-                puts = chain.puts.copy()
-                puts['expiration'] = exp_date
-                puts['option_type'] = 'put'
-                all_puts.append(puts)
-            except Exception:
-                continue
+        # Expirations download in parallel; failed ones are skipped. Column
+        # projection already yields new frames, so they are tagged without copying
+        for chain_calls, chain_puts, exp_date in fetch_chains_concurrently(ticker, relevant_exps[:10]):
+            keep = [c for c in FLOW_COLUMNS if c in chain_calls.columns]
+            calls = chain_calls[keep]
+            calls['expiration'] = exp_date
+            calls['option_type'] = 'call'
+            all_calls.append(calls)
+            
+            keep = [c for c in FLOW_COLUMNS if c in chain_puts.columns]
+            puts = chain_puts[keep]
+            puts['expiration'] = exp_date
+            puts['option_type'] = 'put'
+            all_puts.append(puts)
         
         calls_df = pd.concat(all_calls, ignore_index=True) if all_calls else pd.DataFrame()
         puts_df = pd.concat(all_puts, ignore_index=True) if all_puts else pd.DataFrame()
         
+        # Halve the width of the numeric columns the aggregations scan;
+        # strike stays float64 so displayed levels keep their exact values
+        for df in (calls_df, puts_df):
+            downcast_columns(df, float_cols=('lastPrice', 'bid', 'ask'), int_cols=('volume', 'openInterest'))
+        
         return calls_df, puts_df, current_price
     except Exception:
         return None, None, None
@@ -59,24 +70,63 @@ def calculate_contract_premium(option_data):
     Premium = Last Price × Volume × 100 (contract multiplier)
     
     Args:
-        option_data: DataFrame with option contract data
+        option_data: DataFrame with option contract data (modified in place)
         
     Returns:
-        DataFrame with premium column added
+        The same DataFrame with premium column added
     """
-    df = option_data.copy()
+    df = option_data
     
     # Use last price if available, otherwise midpoint
     if 'lastPrice' in df.columns:
-        price = df['lastPrice']
+        price = df['lastPrice'].to_numpy(dtype=np.float64)
     else:
-        price = (df['bid'] + df['ask']) / 2
+        price = (df['bid'].to_numpy(dtype=np.float64) + df['ask'].to_numpy(dtype=np.float64)) * 0.5
     
-    df['premium'] = price * df['volume'] * 100
+    df['premium'] = price * df['volume'].to_numpy(dtype=np.float64) * 100
     
     return df
 
 
+TOP_CONTRACT_COLUMNS = ['strike', 'expiration', 'volume', 'openInterest', 'premium']
+
+
+def summarize_flow_side(df, top_n=5):
+    """
+    Totals, unusual activity and top contracts for one side of the chain.
+    
+    Reads premium, volume and open interest once as arrays and derives every
+    statistic from them instead of re-scanning the frame per metric.
+    
+    Args:
+        df: Calls or puts DataFrame with a premium column
+        top_n: Number of top contracts by premium to return
+        
+    Returns:
+        Tuple of (total_premium, total_volume, unusual_df, top_df)
+    """
+    if df.empty:
+        return 0, 0, pd.DataFrame(), pd.DataFrame()
+    
+    premium = df['premium'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    open_interest = df['openInterest'].to_numpy(dtype=np.float64)
+    
+    # Unusual activity (Volume > 2x Open Interest)
+    unusual = df[volume > 2 * open_interest]
+    
+    # Top contracts by premium; a stable sort keeps nlargest's first-occurrence
+    # order on ties. Like nlargest, rows without a premium only fill any remaining slots.
+    missing = np.isnan(premium)
+    valid = np.flatnonzero(~missing)
+    top_idx = valid[np.argsort(-premium[valid], kind='stable')[:top_n]]
+    if len(top_idx) < top_n:
+        top_idx = np.concatenate([top_idx, np.flatnonzero(missing)[:top_n - len(top_idx)]])
+    top = df.iloc[top_idx][TOP_CONTRACT_COLUMNS]
+    
+    return np.nansum(premium), np.nansum(volume), unusual, top
+
+
 def get_daily_flow_snapshot(symbol, days_back=5):
     """
     Get multi-day options flow data for a symbol.
@@ -104,12 +154,9 @@ def get_daily_flow_snapshot(symbol, days_back=5):
         if not puts_df.empty:
             puts_df = calculate_contract_premium(puts_df)
         
-        # Calculate metrics
-        total_call_premium = calls_df['premium'].sum() if not calls_df.empty else 0
-        total_put_premium = puts_df['premium'].sum() if not puts_df.empty else 0
-        
-        total_call_volume = calls_df['volume'].sum() if not calls_df.empty else 0
-        total_put_volume = puts_df['volume'].sum() if not puts_df.empty else 0
+        # Calculate metrics in one pass per side
+        total_call_premium, total_call_volume, unusual_calls, top_calls = summarize_flow_side(calls_df)
+        total_put_premium, total_put_volume, unusual_puts, top_puts = summarize_flow_side(puts_df)
         
         net_premium = total_call_premium - total_put_premium
         
@@ -117,14 +164,6 @@ def get_daily_flow_snapshot(symbol, days_back=5):
         pc_volume_ratio = total_put_volume / max(total_call_volume, 1)
         pc_premium_ratio = total_put_premium / max(total_call_premium, 1)
         
-        # Unusual activity (Volume > 2x Open Interest)
-        unusual_calls = calls_df[calls_df['volume'] > 2 * calls_df['openInterest']] if not calls_df.empty else pd.DataFrame()
-        unusual_puts = puts_df[puts_df['volume'] > 2 * puts_df['openInterest']] if not puts_df.empty else pd.DataFrame()
-        
-        # Top contracts by premium
-        top_calls = calls_df.nlargest(5, 'premium')[['strike', 'expiration', 'volume', 'openInterest', 'premium']] if not calls_df.empty else pd.DataFrame()
-        top_puts = puts_df.nlargest(5, 'premium')[['strike', 'expiration', 'volume', 'openInterest', 'premium']] if not puts_df.empty else pd.DataFrame()
-        
         return {
             'symbol': symbol,
             'current_price': current_price,
@@ -230,7 +269,7 @@ def get_volatility_analysis(ticker, price_data):
         
         # Initial estimate for IV (using yfinance info)
         try:
-            info = yf.Ticker(ticker).info
+            info = fetch_stock_info(ticker)
             iv_current = info.get('impliedVolatility') # Might be None
             
             # Helper for earnings
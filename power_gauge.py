@@ -2,8 +2,12 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import streamlit as st
+from services.cache import disk_cache
+from services.data_fetcher import fetch_stock_info
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -20,102 +24,120 @@ def normalize(value, min_val, max_val, invert=False):
         return 100 - score
     return score
 
-def get_financial_score(info):
+def normalize_scores(names, values, mins, maxs, invert):
     """
-    Financial Factors (Balance Sheet Strength) - 5 Factors
+    Vectorized normalize() over several factors at once.
+    
+    Args:
+        names: Factor names, in display order
+        values: Raw values (None or NaN score a neutral 50)
+        mins, maxs: Range bounds per factor
+        invert: Per-factor flags for lower-is-better factors
+        
+    Returns:
+        dict of factor name -> score on a 0-100 scale
     """
-    scores = {}
+    vals = np.array(values, dtype=float)
+    mins = np.asarray(mins, dtype=float)
+    maxs = np.asarray(maxs, dtype=float)
     
-    # 1. Debt-to-Equity (Lower is better)
-    de = info.get('debtToEquity', None)
-    # Range: 0 (Great) to 200 (High Debt)
-    scores['Debt/Equity'] = normalize(de, 0, 200, invert=True) 
-
-    # 2. Price-to-Book (Lower is better, value)
-    pb = info.get('priceToBook', None)
-    # Range: 1 (Value) to 10 (Growth/Expensive)
-    scores['Price/Book'] = normalize(pb, 1, 10, invert=True)
-
-    # 3. Return on Equity (Higher is better)
-    roe = info.get('returnOnEquity', None)
-    # Range: 0.05 (Poor) to 0.25 (Great) - Data is often 0.15 for 15%
-    scores['ROE'] = normalize(roe, 0.05, 0.25)
-
-    # 4. Price-to-Sales (Lower is better)
-    ps = info.get('priceToSalesTrailing12Months', None)
-    # Range: 1 (Cheap) to 10 (Expensive)
-    scores['Price/Sales'] = normalize(ps, 1, 10, invert=True)
+    with np.errstate(invalid='ignore'):
+        scores = np.clip((vals - mins) / (maxs - mins) * 100, 0, 100)
+    scores = np.where(invert, 100 - scores, scores)
+    scores = np.where(np.isnan(vals), 50, scores) # Neutral if missing
+    
+    return dict(zip(names, scores.tolist()))
 
-    # 5. Free Cash Flow Yield (Higher is better)
+def get_financial_score(info):
+    """
+    Financial Factors (Balance Sheet Strength) - 5 Factors
+    """
     # Approximation: Free Cashflow / Market Cap
     fcf = info.get('freeCashflow', None)
     mcap = info.get('marketCap', 1)
     fcf_yield = (fcf / mcap) if fcf is not None and mcap is not None and mcap != 0 else None
-    # Range: 0 (None) to 0.05 (5% Yield)
-    scores['FCF Yield'] = normalize(fcf_yield, 0, 0.05)
     
-    return scores
+    return normalize_scores(
+        ['Debt/Equity', 'Price/Book', 'ROE', 'Price/Sales', 'FCF Yield'],
+        [
+            info.get('debtToEquity', None),                  # Lower is better
+            info.get('priceToBook', None),                   # Lower is better, value
+            info.get('returnOnEquity', None),                # Higher is better
+            info.get('priceToSalesTrailing12Months', None),  # Lower is better
+            fcf_yield                                        # Higher is better
+        ],
+        # Ranges: D/E 0-200, P/B 1-10, ROE 5%-25%, P/S 1-10, FCF yield 0-5%
+        mins=[0, 1, 0.05, 1, 0],
+        maxs=[200, 10, 0.25, 10, 0.05],
+        invert=[True, True, False, True, False]
+    )
 
 def get_earnings_score(info):
     """
     Earnings Factors (Performance) - 5 Factors
     """
-    scores = {}
-    
-    # 1. Earnings Growth (Higher better)
-    eg = info.get('earningsGrowth', None)
-    # Range: -0.1 to 0.5 (50%)
-    scores['Growth Rate'] = normalize(eg, -0.1, 0.5)
-    
-    # 2. Earnings Surprise (Compare actual vs estimate from info if available, else proxy)
-    # Proxy: simply check if trailing EPS > forward EPS? No.
-    # We'll use 'earningsQuarterlyGrowth' as a proxy for "Surprise/Momentum"
-    eqg = info.get('earningsQuarterlyGrowth', None)
-    scores['Earnings Surprise'] = normalize(eqg, -0.2, 0.5)
-
-    # 3. Earnings Trend (Revenue Growth as proxy)
-    rg = info.get('revenueGrowth', None)
-    scores['Earnings Trend'] = normalize(rg, -0.1, 0.4)
-
-    # 4. Projected P/E (Lower is better)
+    # Projected P/E: if Forward < Trailing, expectations are improving (Bullish)
     fpe = info.get('forwardPE', None)
     tpe = info.get('trailingPE', None)
-    # If Forward < Trailing, expectations are improving (Bullish)
     if fpe and tpe:
-        ratio = tpe / fpe 
         # > 1 means Forward is lower (Cheaper) -> Good
-        scores['Projected P/E'] = normalize(ratio, 0.8, 1.5)
+        pe_value, pe_min, pe_max, pe_invert = tpe / fpe, 0.8, 1.5, False
     else:
-        scores['Projected P/E'] = normalize(fpe, 10, 50, invert=True) # Fallback
-
-    # 5. Earnings Consistency (Margins as proxy for quality)
-    pm = info.get('profitMargins', None)
-    scores['Consistency'] = normalize(pm, 0.05, 0.25)
+        pe_value, pe_min, pe_max, pe_invert = fpe, 10, 50, True # Fallback
     
-    return scores
+    return normalize_scores(
+        ['Growth Rate', 'Earnings Surprise', 'Earnings Trend', 'Projected P/E', 'Consistency'],
+        [
+            info.get('earningsGrowth', None),
+            # 'earningsQuarterlyGrowth' as a proxy for "Surprise/Momentum"
+            info.get('earningsQuarterlyGrowth', None),
+            # Revenue Growth as proxy for trend
+            info.get('revenueGrowth', None),
+            pe_value,
+            # Margins as proxy for quality
+            info.get('profitMargins', None)
+        ],
+        mins=[-0.1, -0.2, -0.1, pe_min, 0.05],
+        maxs=[0.5, 0.5, 0.4, pe_max, 0.25],
+        invert=[False, False, False, pe_invert, False]
+    )
 
-def get_expert_score(info, ticker_obj):
+def get_expert_score(info, insider):
     """
     Expert & Industry Factors (Sentiment) - 5 Factors
-    """
-    scores = {}
     
-    # 1. Estimate Trend (Target Price vs Current)
+    Args:
+        info: Ticker info dict
+        insider: Prefetched insider transactions DataFrame, or None if unavailable
+    """
+    # Estimate Trend (Target Price vs Current)
     current = info.get('currentPrice', 1)
     target = info.get('targetMeanPrice', current)
     upside = (target - current) / current
-    # Range: -0.1 to 0.3 (30% upside)
-    scores['Analyst Target'] = normalize(upside, -0.1, 0.3)
     
-    # 2. Short Interest (Lower is better usually, unless squeeze)
-    si = info.get('shortPercentOfFloat', 0)
-    # Range: 0 to 0.2 (20% short interest is high)
-    scores['Short Interest'] = normalize(si, 0, 0.2, invert=True)
+    # Range: upside -10% to 30%, short interest 0-20% (lower better),
+    # rating 1 Strong Buy .. 5 Sell (lower better), beta 0.5-1.5
+    sentiment = normalize_scores(
+        ['Analyst Target', 'Short Interest', 'Analyst Rating', 'Industry Relative'],
+        [
+            upside,
+            info.get('shortPercentOfFloat', 0),
+            info.get('recommendationMean', 3),
+            info.get('beta', 1)
+        ],
+        mins=[-0.1, 0, 1.5, 0.5],
+        maxs=[0.3, 0.2, 3.5, 1.5],
+        invert=[False, True, True, False]
+    )
+    
+    scores = {
+        'Analyst Target': sentiment['Analyst Target'],
+        'Short Interest': sentiment['Short Interest']
+    }
     
     # 3. Insider Activity
     try:
-        insider = ticker_obj.insider_transactions
-        if not insider.empty:
+        if insider is not None and not insider.empty:
             # Net shares bought/sold in last 6 months
             recent = insider.sort_values('Start Date', ascending=False).head(10)
             net_shares = recent['Shares'].sum() # Assuming positive is buy? 
@@ -125,71 +147,130 @@ def get_expert_score(info, ticker_obj):
         else:
             scores['Insider Activity'] = 50
     except Exception as e:
-        logger.info(f"Error fetching insider transactions: {e}")
+        logger.info(f"Error reading insider transactions: {e}")
         scores['Insider Activity'] = 50
 
-    # 4. Analyst Rating
-    rec = info.get('recommendationMean', 3) # 1 is Strong Buy, 5 is Sell
-    # Range: 1 (Best) to 5 (Worst)
-    scores['Analyst Rating'] = normalize(rec, 1.5, 3.5, invert=True)
-
-    # 5. Industry Rel Strength
-    # Compare Ticker Beta to 1? (Higher Beta = likely outperforming in bull market)
-    beta = info.get('beta', 1)
-    scores['Industry Relative'] = normalize(beta, 0.5, 1.5)
+    scores['Analyst Rating'] = sentiment['Analyst Rating']
+    # Higher Beta = likely outperforming in bull market
+    scores['Industry Relative'] = sentiment['Industry Relative']
     
     return scores
 
+def ewm_weights(n, span):
+    """
+    Weights w such that `w @ values` is the last value of pandas
+    `ewm(span=span, adjust=False).mean()` over n values.
+    
+    The recursive EMA unrolls to alpha * (1 - alpha)**age for every point,
+    with the seed point carrying the remaining (1 - alpha)**age.
+    """
+    alpha = 2 / (span + 1)
+    weights = alpha * (1 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    weights[0] = (1 - alpha) ** (n - 1)
+    return weights
+
+@lru_cache(maxsize=32)
+def chaikin_trend_kernel(n, fast=3, slow=10, lag=5):
+    """
+    Single weight vector turning an n-bar ADL into the Chaikin oscillator's
+    change over `lag` bars: (EMA_fast - EMA_slow) now minus `lag` bars ago.
+    
+    Histories mostly share a length, so the kernel is built once and reused.
+    """
+    kernel = ewm_weights(n, fast) - ewm_weights(n, slow)
+    kernel[:n - lag] -= ewm_weights(n - lag, fast) - ewm_weights(n - lag, slow)
+    kernel.flags.writeable = False
+    return kernel
+
 def get_technical_score(ticker, history):
     """
     Technical Factors (Price/Volume) - 5 Factors
     """
-    scores = {}
-    
     if history.empty or len(history) < 50:
         return {k: 50 for k in ['Rel Strength', 'Chaikin Money Flow', 'Chaikin Trend', 'Price Trend ROC', 'Volume Trend']}
 
-    close = history['Close']
-    volume = history['Volume']
-    high = history['High']
-    low = history['Low']
+    close = history['Close'].to_numpy(dtype=np.float64)
+    volume = history['Volume'].to_numpy(dtype=np.float64)
+    high = history['High'].to_numpy(dtype=np.float64)
+    low = history['Low'].to_numpy(dtype=np.float64)
     
     # 1. Relative Strength vs SPY (Approximate using beta adjustment or just absolute momentum)
     # We will fetch SPY history briefly? No, expensive.
     # Use simple ROC (Rate of Change) 6-month as proxy for "Strength"
-    roc_126 = (close.iloc[-1] / close.iloc[-126]) - 1 if len(close) > 126 else 0
-    scores['Rel Strength'] = normalize(roc_126, -0.1, 0.3)
+    roc_126 = (close[-1] / close[-126]) - 1 if len(close) > 126 else 0
 
     # 2. Chaikin Money Flow (CMF) - 21 Day
-    # MFV = ((C - L) - (H - C)) / (H - L) * V
-    mfv = ((close - low) - (high - close)) / (high - low) * volume
-    mfv = mfv.fillna(0)
-    cmf = mfv.rolling(21).sum() / volume.rolling(21).sum()
-    cmf_val = cmf.iloc[-1]
-    # Range: -0.2 to 0.2
-    scores['Chaikin Money Flow'] = normalize(cmf_val, -0.2, 0.2)
+    # MFV = ((C - L) - (H - C)) / (H - L) * V, zero on flat bars
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mfv = np.where(high != low, ((close - low) - (high - close)) / (high - low) * volume, 0.0)
+        mfv[np.isnan(mfv)] = 0
+        # Only the latest 21-day window is scored
+        cmf_val = mfv[-21:].sum() / volume[-21:].sum()
 
     # 3. Chaikin Trend (EMA(3) calc'd on ADL - EMA(10) calc'd on ADL)
-    adl = mfv.cumsum()
-    chaikin_osc = adl.ewm(span=3, adjust=False).mean() - adl.ewm(span=10, adjust=False).mean()
+    adl = np.cumsum(mfv)
     # Normalize simply based on positive/negative
     # We need a reference scale for Oscillator. It's volume based, so huge numbers.
     # Compare to moving average of itself?
-    # Simplified: Is it rising?
-    osc_change = chaikin_osc.diff(5).iloc[-1]
-    scores['Chaikin Trend'] = 60 if osc_change > 0 else 40
+    # Simplified: Is it rising? (oscillator now vs 5 bars ago, one fused pass)
+    osc_change = chaikin_trend_kernel(len(adl)) @ adl
 
     # 4. Price Trend ROC (42 day)
-    roc_42 = (close.iloc[-1] / close.iloc[-42]) - 1 if len(close) > 42 else 0
-    scores['Price Trend ROC'] = normalize(roc_42, -0.1, 0.2)
+    roc_42 = (close[-1] / close[-42]) - 1 if len(close) > 42 else 0
     
     # 5. Volume Trend (Vol 20 vs Vol 90)
-    vol_20 = volume.rolling(20).mean().iloc[-1]
-    vol_90 = volume.rolling(90).mean().iloc[-1]
+    vol_20 = volume[-20:].mean()
+    vol_90 = volume[-90:].mean() if len(volume) >= 90 else np.nan
     vol_ratio = vol_20 / vol_90 if vol_90 > 0 else 1
-    scores['Volume Trend'] = normalize(vol_ratio, 0.8, 1.5)
     
-    return scores
+    # Ranges: ROC126 -10%..30%, CMF -0.2..0.2, ROC42 -10%..20%, Vol ratio 0.8..1.5
+    scores = normalize_scores(
+        ['Rel Strength', 'Chaikin Money Flow', 'Price Trend ROC', 'Volume Trend'],
+        [roc_126, cmf_val, roc_42, vol_ratio],
+        mins=[-0.1, -0.2, -0.1, 0.8],
+        maxs=[0.3, 0.2, 0.2, 1.5],
+        invert=[False, False, False, False]
+    )
+    
+    return {
+        'Rel Strength': scores['Rel Strength'],
+        'Chaikin Money Flow': scores['Chaikin Money Flow'],
+        'Chaikin Trend': 60 if osc_change > 0 else 40,
+        'Price Trend ROC': scores['Price Trend ROC'],
+        'Volume Trend': scores['Volume Trend']
+    }
+
+@disk_cache(ttl=300) # Same TTL as calculate_power_gauge, but survives app restarts
+def fetch_gauge_data(ticker):
+    """
+    Fetches the fundamentals and 1y daily history used by the Power Gauge.
+    
+    Both requests are independent, so they are issued concurrently.
+    
+    Returns:
+        Tuple of (info dict, history DataFrame)
+    """
+    def _safe_info():
+        # Safely fetch info, as this is known to fail on Streamlit Cloud due to Yahoo API crumb issues
+        try:
+            info = fetch_stock_info(ticker)
+            return info if info is not None else {}
+        except Exception as info_err:
+            logger.warning(f"Failed to fetch yfinance info for {ticker}: {info_err}")
+            return {}
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        info_future = executor.submit(_safe_info)
+        history_future = executor.submit(yf.Ticker(ticker).history, period="1y")
+        return info_future.result(), history_future.result()
+
+def fetch_insider_transactions(ticker):
+    """Fetches insider transactions, or None if Yahoo has none for the ticker."""
+    try:
+        return yf.Ticker(ticker).insider_transactions
+    except Exception as e:
+        logger.info(f"Error fetching insider transactions: {e}")
+        return None
 
 @st.cache_data(ttl=300) # Cache for 5 mins to avoid sticking on rate limits
 def calculate_power_gauge(ticker):
@@ -198,22 +279,16 @@ def calculate_power_gauge(ticker):
     Returns nested dict of scores and final rating.
     """
     try:
-        t = yf.Ticker(ticker)
-        
-        # Safely fetch info, as this is known to fail on Streamlit Cloud due to Yahoo API crumb issues
-        try:
-            info = t.info
-            if info is None:
-                info = {}
-        except Exception as info_err:
-            logger.warning(f"Failed to fetch yfinance info for {ticker}: {info_err}")
-            info = {}
-            
-        history = t.history(period="1y")
+        # Overlap the info, history and insider round-trips
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            gauge_future = executor.submit(fetch_gauge_data, ticker)
+            insider_future = executor.submit(fetch_insider_transactions, ticker)
+            info, history = gauge_future.result()
+            insider = insider_future.result()
         
         financials = get_financial_score(info)
         earnings = get_earnings_score(info)
-        experts = get_expert_score(info, t)
+        experts = get_expert_score(info, insider)
         technicals = get_technical_score(ticker, history)
         
         # Aggregate
@@ -225,22 +300,22 @@ def calculate_power_gauge(ticker):
         }
         
         # Calculate Category Scores
-        cat_scores = {}
-        total_score = 0
+        cat_scores = {
+            cat: np.fromiter(metrics.values(), dtype=np.float64, count=len(metrics)).mean()
+            for cat, metrics in categories.items()
+        }
         
-        for cat, metrics in categories.items():
-            avg = np.mean(list(metrics.values()))
-            cat_scores[cat] = avg
-            total_score += avg
-            
-        final_score = total_score / 4 # Equal weight for now
+        final_score = sum(cat_scores.values()) / len(cat_scores) # Equal weight for now
         
         # Determine Rating
         if final_score >= 65: rating = "BULLISH"
         elif final_score <= 35: rating = "BEARISH"
         else: rating = "NEUTRAL"
         
-        # Extract metadata for the detailed UI panels
+        # Extract metadata for the detailed UI panels from the history arrays
+        hist_close = history['Close'].to_numpy(dtype=np.float64) if not history.empty else np.empty(0)
+        hist_volume = history['Volume'].to_numpy(dtype=np.float64) if not history.empty else np.empty(0)
+        n_bars = len(hist_close)
         metadata = {
             "currentRatio": info.get("currentRatio"),
             "debtToEquity": info.get("debtToEquity", 0) / 100 if info.get("debtToEquity") else None, # Assuming it's given as 29 for 0.29
@@ -255,10 +330,10 @@ def calculate_power_gauge(ticker):
             "beta": info.get("beta"),
             "fiftyTwoWeekHigh": info.get("fiftyTwoWeekHigh"),
             "fiftyTwoWeekLow": info.get("fiftyTwoWeekLow"),
-            "avgVol20Day": history['Volume'].rolling(20).mean().iloc[-1] if not history.empty and len(history)>=20 else None,
-            "avgVol90Day": history['Volume'].rolling(90).mean().iloc[-1] if not history.empty and len(history)>=90 else None,
-            "chg4wk": ((history['Close'].iloc[-1] / history['Close'].iloc[-20]) - 1) * 100 if not history.empty and len(history)>=20 else None,
-            "chg24wk": ((history['Close'].iloc[-1] / history['Close'].iloc[-120]) - 1) * 100 if not history.empty and len(history)>=120 else None
+            "avgVol20Day": hist_volume[-20:].mean() if n_bars >= 20 else None,
+            "avgVol90Day": hist_volume[-90:].mean() if n_bars >= 90 else None,
+            "chg4wk": ((hist_close[-1] / hist_close[-20]) - 1) * 100 if n_bars >= 20 else None,
+            "chg24wk": ((hist_close[-1] / hist_close[-120]) - 1) * 100 if n_bars >= 120 else None
         }
         
         return {
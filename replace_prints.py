@@ -1,5 +1,6 @@
+import ast
 import os
-import re
+from concurrent.futures import ThreadPoolExecutor
 
 PYTHON_FILES = [
     'services/data_fetcher.py',
@@ -20,40 +21,83 @@ PYTHON_FILES = [
 
 IMPORT_STMT = "from services.logger import setup_logger\nlogger = setup_logger(__name__)\n"
 
-for file_path in PYTHON_FILES:
+
+def _looks_like_error(call):
+    """True if the literal text of a print's first argument mentions an error."""
+    if not call.args:
+        return False
+    first = call.args[0]
+    parts = first.values if isinstance(first, ast.JoinedStr) else [first]
+    text = ''.join(p.value for p in parts if isinstance(p, ast.Constant) and isinstance(p.value, str))
+    return 'error' in text.lower() or 'exception' in text.lower()
+
+
+def rewrite_prints(source):
+    """
+    Replaces print(...) calls with logger.info/logger.error in one AST pass.
+
+    The AST only locates the calls; edits are spliced into the original text
+    so comments and formatting survive, and prints inside strings are ignored.
+
+    Returns:
+        The rewritten source, or None if there was nothing to replace
+    """
+    tree = ast.parse(source)
+
+    # AST column offsets are UTF-8 byte offsets, so splice on bytes
+    data = source.encode('utf-8')
+    line_starts = [0]
+    for line in data.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+
+    def offset(lineno, col):
+        return line_starts[lineno - 1] + col
+
+    edits = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'print':
+            level = 'error' if _looks_like_error(node) else 'info'
+            start = offset(node.func.lineno, node.func.col_offset)
+            end = offset(node.func.end_lineno, node.func.end_col_offset)
+            edits.append((start, end, f'logger.{level}'.encode('utf-8')))
+
+    if not edits:
+        return None
+
+    # Add import after the last top-level import if not present
+    if 'setup_logger' not in source:
+        imports = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+        insert_pos = line_starts[imports[-1].end_lineno] if imports else 0
+        edits.append((insert_pos, insert_pos, IMPORT_STMT.encode('utf-8')))
+
+    # Apply from the end so earlier offsets stay valid
+    for start, end, replacement in sorted(edits, key=lambda e: e[0], reverse=True):
+        data = data[:start] + replacement + data[end:]
+
+    return data.decode('utf-8')
+
+
+def _process(file_path):
+    """Rewrites one file in place; files are independent, so they run in parallel."""
     if not os.path.exists(file_path):
-        continue
-        
+        return
+
     with open(file_path, 'r') as f:
         content = f.read()
-        
+
     if 'print(' not in content:
-        continue
-        
-    # Check if we should ignore (maybe only print is in __main__)
-    # Let's just do a simple replacement for now.
-    
-    # Add import if not present
-    if 'setup_logger' not in content:
-        # Insert after the last import
-        import_match = list(re.finditer(r'^import [^\n]+|^from [^\n]+', content, flags=re.MULTILINE))
-        if import_match:
-            last_import = import_match[-1]
-            insert_pos = last_import.end() + 1
-            content = content[:insert_pos] + IMPORT_STMT + content[insert_pos:]
-        else:
-            content = IMPORT_STMT + content
-            
-    # Replace print( with logger.info( or error( if it looks like an error
-    def replace_print(match):
-        stmt = match.group(0)
-        if 'error' in stmt.lower() or 'exception' in stmt.lower():
-            return stmt.replace('print(', 'logger.error(')
-        return stmt.replace('print(', 'logger.info(')
-        
-    content = re.sub(r'^(\s*)print\(', replace_print, content, flags=re.MULTILINE)
-    
+        return
+
+    content = rewrite_prints(content)
+    if content is None:
+        return
+
     with open(file_path, 'w') as f:
         f.write(content)
-        
-print("Prints replaced.")
+
+
+if __name__ == '__main__':
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_process, PYTHON_FILES))
+
+    print("Prints replaced.")
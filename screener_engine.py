@@ -1,10 +1,12 @@
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from yahooquery import Ticker
+from yahooquery.session_management import initialize_session
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from services.data_fetcher import load_tickers_csv
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -12,7 +14,7 @@ logger = setup_logger(__name__)
 @st.cache_data(ttl=3600*24) # Cache for 24 hours
 def get_screener_universe():
     try:
-        df = pd.read_csv('tickers.csv')
+        df = load_tickers_csv()
         # Ensure Symbol column exists
         if 'Symbol' in df.columns:
             return df['Symbol'].tolist()
@@ -23,11 +25,203 @@ def get_screener_universe():
         # Fallback to a smaller list if file missing
         return ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "META", "BRK-B", "UNH", "JNJ"]
 
+# OHLCV fields the technicals read, in cube order
+TECHNICAL_FIELDS = ['Close', 'High', 'Low', 'Volume']
+
+def _field_cube(hist_data, tickers):
+    """
+    Reshapes wide history into one (days, fields, tickers) float64 array.
+
+    A single reindex lines the columns up as TECHNICAL_FIELDS x tickers, so
+    the whole block converts to NumPy once instead of slicing per field or
+    per ticker. Missing fields or tickers come back as NaN.
+    """
+    if not isinstance(hist_data.columns, pd.MultiIndex):
+        # Flat OHLCV columns hold a single ticker
+        hist_data = pd.concat({tickers[0]: hist_data}, axis=1).swaplevel(axis=1)
+    columns = pd.MultiIndex.from_product([TECHNICAL_FIELDS, tickers])
+    values = hist_data.reindex(columns=columns).to_numpy(dtype=np.float64)
+    return values.reshape(len(hist_data), len(TECHNICAL_FIELDS), len(tickers))
+
+def _last_window(frame, window, stat='mean'):
+    """
+    Last row of frame.rolling(window).<stat>(), reduced over the final window only.
+
+    Only the latest value is used by the screener, so there is no need to
+    compute the whole rolling series.
+    """
+    tail = frame.iloc[-window:]
+    return getattr(tail, stat)().where(tail.notna().all() & (len(tail) == window))
+
+def compute_technicals(hist_data, tickers):
+    """
+    Computes the screener's technical indicators for every ticker at once.
+
+    Each ticker's rows with a missing Close are pushed to the top of its
+    column, so the indicators see the same gap-free history a per-ticker
+    dropna would give, and the rolling/ewm passes run once over the whole
+    (days, tickers) frame instead of once per ticker.
+
+    Args:
+        hist_data: Wide history with (field, ticker) columns, as returned
+            by fetch_chunk_history
+        tickers: List of ticker symbols
+
+    Returns:
+        DataFrame indexed by ticker with Volume, Change%, RSI, SMA50, SMA200,
+        HV_20, EMA8-EMA89, ADX and StochK
+    """
+    cube = _field_cube(hist_data, tickers)
+
+    # Stable sort on "has a close" moves missing rows up without reordering the rest
+    has_close = ~np.isnan(cube[:, :1, :])
+    order = np.argsort(has_close, axis=0, kind='stable')
+    cube = np.take_along_axis(np.where(has_close, cube, np.nan), order, axis=0)
+
+    close, high, low, volume = (
+        pd.DataFrame(cube[:, i, :], columns=tickers) for i in range(len(TECHNICAL_FIELDS))
+    )
+    n_bars = close.count()
+
+    # RSI (14)
+    delta = close.diff()
+    gain = _last_window(delta.clip(lower=0), 14)
+    loss = _last_window(-delta.clip(upper=0), 14)
+    rsi = 100 - 100 / (1 + gain / loss)
+
+    # SMAs and 20-day historical volatility
+    sma50 = _last_window(close, 50)
+    sma200 = _last_window(close, 200).where(n_bars >= 200, sma50)
+    # Only the last 21 closes feed the final 20 log returns; log1p of the
+    # simple return is the stabler form for the small daily moves involved
+    log_ret = np.log1p(close.iloc[-21:].pct_change(fill_method=None))
+    hv = _last_window(log_ret, 20, 'std') * np.sqrt(252) * 100
+
+    # ADX
+    prev_close = close.shift()
+    pdm = high.diff().clip(lower=0)
+    ndm = (-low.diff()).clip(lower=0)
+    tr = np.maximum(high - low, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+    atr = tr.rolling(14).mean()
+    pdi = 100 * pdm.ewm(alpha=1/14).mean() / atr
+    ndi = 100 * ndm.ewm(alpha=1/14).mean() / atr
+    dx = (pdi - ndi).abs() / (pdi + ndi).abs() * 100
+
+    # Stoch %K
+    low_8 = low.rolling(8).min()
+    k = 100 * (close - low_8) / (high.rolling(8).max() - low_8)
+
+    last_close = close.iloc[-1]
+    prev = prev_close.iloc[-1]
+    technicals = pd.DataFrame({
+        'Volume': volume.iloc[-1],
+        'Change%': (last_close - prev) / prev * 100,
+        'RSI': rsi,
+        'SMA50': sma50,
+        'SMA200': sma200,
+        'HV_20': hv,
+        **{f'EMA{span}': close.ewm(span=span, adjust=False).mean().iloc[-1] for span in (8, 21, 34, 55, 89)},
+        'ADX': dx.rolling(14).mean().iloc[-1],
+        'StochK': k.rolling(3).mean().iloc[-1],
+    }, index=tickers)
+
+    # Tickers with under 20 closes are left without technicals
+    return technicals.where(n_bars >= 20)
+
+# Yahoo batch endpoints handle ~20 symbols per request comfortably
+CHUNK_SIZE = 20
+MAX_WORKERS = 16
+
+# yahooquery history column -> screener OHLCV field
+HISTORY_FIELDS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+# Share counts and dollar sizes stay float64 so displayed figures are exact;
+# every other screener column is stored as float32
+EXACT_COLUMNS = ('MarketCap', 'Float', 'AvgVol', 'Volume')
+
+# Screener column -> flattened quoteSummary field.
+# financialData covers price, ROE, margins, growth and recommendations;
+# defaultKeyStatistics covers beta, float, PE and market cap.
+FUNDAMENTAL_FIELDS = {
+    'Price': 'financialData_currentPrice',
+    'MarketCap': 'defaultKeyStatistics_enterpriseValue',
+    'Beta': 'defaultKeyStatistics_beta',
+    'PE': 'defaultKeyStatistics_forwardPE',
+    'Float': 'defaultKeyStatistics_floatShares',
+    'DivYield': 'defaultKeyStatistics_lastDividendValue',
+    'AvgVol': 'defaultKeyStatistics_sharesOutstanding',  # Approximation if vol missing
+    # Navellier Fundamentals
+    'ROE': 'financialData_returnOnEquity',
+    'OpMargin': 'financialData_operatingMargins',
+    'RevGrowth': 'financialData_revenueGrowth',
+    'EarnGrowth': 'financialData_earningsGrowth',
+    # Analyst
+    'AnalystRec': 'financialData_recommendationMean',
+    # Earnings growth from key stats
+    'EQGrowth': 'defaultKeyStatistics_earningsQuarterlyGrowth',
+}
+
+def fetch_chunk_fundamentals(chunk, session=None):
+    """
+    Fetches fundamentals for one chunk of tickers with a single yahooquery call.
+
+    Args:
+        chunk: List of ticker symbols
+        session: Optional yahooquery session shared between chunks
+
+    Returns:
+        DataFrame indexed by ticker with the screener's fundamental columns
+    """
+    # One quoteSummary request covering both modules
+    raw = Ticker(chunk, asynchronous=False, session=session).get_modules(['financialData', 'defaultKeyStatistics'])
+
+    # Symbols Yahoo has no data for come back as an error string
+    records = [{'symbol': symbol, **modules} for symbol, modules in raw.items() if isinstance(modules, dict)]
+    df = pd.json_normalize(records, sep='_')
+    if 'symbol' in df.columns:
+        df = df.set_index('symbol').rename_axis(None)
+
+    chunk_data = df.reindex(index=chunk, columns=list(FUNDAMENTAL_FIELDS.values()))
+    chunk_data.columns = list(FUNDAMENTAL_FIELDS)
+
+    # json_normalize already types clean numeric fields; only columns mixing
+    # in strings or dicts come back as object and need coercing
+    mixed = chunk_data.columns[chunk_data.dtypes == object]
+    if len(mixed):
+        chunk_data[mixed] = chunk_data[mixed].apply(pd.to_numeric, errors='coerce')
+    return chunk_data.astype(np.float64)
+
+def fetch_chunk_history(chunk, session=None):
+    """
+    Downloads 3 months of adjusted daily history for one chunk of tickers.
+
+    Uses yahooquery's asynchronous backend, which issues the per-symbol chart
+    requests concurrently over pooled connections, then pivots the long
+    (symbol, date) result once into the (field, ticker) column layout that
+    yf.download produces when grouping by column.
+
+    Args:
+        chunk: List of ticker symbols
+        session: Optional yahooquery session shared between chunks
+    """
+    hist = Ticker(chunk, asynchronous=True, session=session).history(period="3mo", interval="1d", adj_ohlc=True)
+    if not isinstance(hist, pd.DataFrame) or hist.empty:
+        raise ValueError("no price history returned")
+
+    hist = hist.reset_index()
+    # Closed sessions are dates and a live session is a timestamp; key both by calendar day
+    hist['date'] = pd.to_datetime(hist['date'].astype(str).str[:10])
+    hist = hist.drop_duplicates(subset=['symbol', 'date'], keep='last')
+
+    wide = hist.pivot(index='date', columns='symbol', values=list(HISTORY_FIELDS))
+    return wide.rename(columns=HISTORY_FIELDS, level=0)
+
 @st.cache_data(ttl=3600*6) # Cache for 6 hours
 def fetch_screener_data(tickers, limit=None):
     """
     Batch fetch fundamental + price + technical data for screener.
-    Optimized: 2 yahooquery calls per chunk, 3mo history, threading enabled.
+    Tickers are split into chunks whose fundamentals and history requests
+    all run concurrently in a thread pool.
     """
     if not tickers:
         return pd.DataFrame()
@@ -35,147 +229,48 @@ def fetch_screener_data(tickers, limit=None):
     if limit:
         tickers = tickers[:limit]
 
-    CHUNK_SIZE = 50  # Larger chunks = fewer round trips
-    all_data = []
+    chunks = [tickers[i:i + CHUNK_SIZE] for i in range(0, len(tickers), CHUNK_SIZE)]
+    fundamentals = [None] * len(chunks)
+    histories = [None] * len(chunks)
     
     progress_bar = st.progress(0)
     status_text = st.empty()
-    total_chunks = (len(tickers) + CHUNK_SIZE - 1) // CHUNK_SIZE
 
-    for i in range(0, len(tickers), CHUNK_SIZE):
-        chunk = tickers[i:i + CHUNK_SIZE]
-        current_chunk_idx = i // CHUNK_SIZE + 1
-        status_text.text(f"Scanning batch {current_chunk_idx}/{total_chunks} ({len(chunk)} tickers)...")
-        progress_bar.progress(current_chunk_idx / total_chunks)
-        
-        try:
-            # --- STEP 1: Single yahooquery call with 2 modules (not 4) ---
-            # financial_data covers: price, ROE, margins, growth, recommendations
-            # key_stats covers: beta, float, PE, marketcap
-            yq = Ticker(chunk, asynchronous=False)
-            financials = yq.financial_data   # ROE, margins, growth, price, recs
-            stats = yq.key_stats             # beta, float, PE, earningsQuarterlyGrowth
-            
-            df_fin = pd.DataFrame(financials).T
-            df_stats = pd.DataFrame(stats).T
-
-            # Helper to safely extract numeric from df
-            def safe_num(df, col):
-                if col in df.columns:
-                    return pd.to_numeric(df[col], errors='coerce')
-                return pd.Series(dtype=float, index=df.index)
-
-            chunk_data = pd.DataFrame(index=chunk)
-            chunk_data['Price']     = safe_num(df_fin, 'currentPrice')
-            chunk_data['MarketCap'] = safe_num(df_stats, 'enterpriseValue')
-            chunk_data['Beta']      = safe_num(df_stats, 'beta')
-            chunk_data['PE']        = safe_num(df_stats, 'forwardPE')
-            chunk_data['Float']     = safe_num(df_stats, 'floatShares')
-            chunk_data['DivYield']  = safe_num(df_stats, 'lastDividendValue')
-            chunk_data['AvgVol']    = safe_num(df_stats, 'sharesOutstanding')  # Approximation if vol missing
-            # Navellier Fundamentals
-            chunk_data['ROE']       = safe_num(df_fin, 'returnOnEquity')
-            chunk_data['OpMargin']  = safe_num(df_fin, 'operatingMargins')
-            chunk_data['RevGrowth'] = safe_num(df_fin, 'revenueGrowth')
-            chunk_data['EarnGrowth']= safe_num(df_fin, 'earningsGrowth')
-            # Analyst
-            chunk_data['AnalystRec']= safe_num(df_fin, 'recommendationMean')
-            # Earnings growth from key_stats
-            chunk_data['EQGrowth']  = safe_num(df_stats, 'earningsQuarterlyGrowth')
-            
-            # --- STEP 2: Historical Data for Technicals (3 months, threaded) ---
-            hist_data = yf.download(
-                chunk, period="3mo", interval="1d",
-                group_by='ticker', progress=False,
-                threads=True,    # Use threading for parallel downloads
-                auto_adjust=True
-            )
-            
-            rsi_d, sma50_d, sma200_d, hv_d = {}, {}, {}, {}
-            ema8_d, ema21_d, ema34_d, ema55_d, ema89_d = {}, {}, {}, {}, {}
-            adx_d, stochk_d = {}, {}
-            vol_d, change_d = {}, {}
-
-            for ticker in chunk:
-                try:
-                    if isinstance(hist_data.columns, pd.MultiIndex):
-                        if ticker not in hist_data.columns.get_level_values(0):
-                            continue
-                        df_t = hist_data.xs(ticker, axis=1, level=0).copy()
-                    else:
-                        df_t = hist_data.copy()
-                    
-                    df_t = df_t.dropna(subset=['Close'])
-                    if len(df_t) < 20:
-                        continue
-                    
-                    close = df_t['Close'].squeeze()
-                    high  = df_t['High'].squeeze()
-                    low   = df_t['Low'].squeeze()
-                    volume= df_t['Volume'].squeeze()
-
-                    # Volume
-                    vol_d[ticker] = volume.iloc[-1]
-                    # Change %
-                    if len(close) >= 2:
-                        change_d[ticker] = ((close.iloc[-1] - close.iloc[-2]) / close.iloc[-2]) * 100
-
-                    # RSI (14)
-                    delta = close.diff()
-                    gain = delta.where(delta > 0, 0).rolling(14).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-                    rsi_d[ticker] = (100 - 100 / (1 + gain / loss)).iloc[-1]
-
-                    # SMAs
-                    sma50_d[ticker]  = close.rolling(50).mean().iloc[-1]
-                    sma200_d[ticker] = close.rolling(200).mean().iloc[-1] if len(close) >= 200 else sma50_d[ticker]
-                    hv = np.log(close / close.shift(1)).rolling(20).std().iloc[-1] * np.sqrt(252) * 100
-                    hv_d[ticker] = hv
-
-                    # EMAs
-                    ema8_d[ticker]  = close.ewm(span=8,  adjust=False).mean().iloc[-1]
-                    ema21_d[ticker] = close.ewm(span=21, adjust=False).mean().iloc[-1]
-                    ema34_d[ticker] = close.ewm(span=34, adjust=False).mean().iloc[-1]
-                    ema55_d[ticker] = close.ewm(span=55, adjust=False).mean().iloc[-1]
-                    ema89_d[ticker] = close.ewm(span=89, adjust=False).mean().iloc[-1]
-
-                    # ADX
-                    pdm = high.diff().clip(lower=0)
-                    ndm = (-low.diff()).clip(lower=0)
-                    tr  = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
-                    atr = tr.rolling(14).mean()
-                    pdi = 100 * pdm.ewm(alpha=1/14).mean() / atr
-                    ndi = 100 * ndm.ewm(alpha=1/14).mean() / atr
-                    dx  = (pdi - ndi).abs() / (pdi + ndi).abs() * 100
-                    adx_d[ticker] = dx.rolling(14).mean().iloc[-1]
-
-                    # Stoch %K
-                    k = 100 * (close - low.rolling(8).min()) / (high.rolling(8).max() - low.rolling(8).min())
-                    stochk_d[ticker] = k.rolling(3).mean().iloc[-1]
-
-                except Exception:
-                    continue
-
-            chunk_data['Volume']  = pd.Series(vol_d)
-            chunk_data['Change%'] = pd.Series(change_d)
-            chunk_data['PreMkt%'] = 0.0  # Not available without live feed
-            chunk_data['RSI']     = pd.Series(rsi_d)
-            chunk_data['SMA50']   = pd.Series(sma50_d)
-            chunk_data['SMA200']  = pd.Series(sma200_d)
-            chunk_data['HV_20']   = pd.Series(hv_d)
-            chunk_data['EMA8']    = pd.Series(ema8_d)
-            chunk_data['EMA21']   = pd.Series(ema21_d)
-            chunk_data['EMA34']   = pd.Series(ema34_d)
-            chunk_data['EMA55']   = pd.Series(ema55_d)
-            chunk_data['EMA89']   = pd.Series(ema89_d)
-            chunk_data['ADX']     = pd.Series(adx_d)
-            chunk_data['StochK']  = pd.Series(stochk_d)
-
-            all_data.append(chunk_data)
+    # One pooled session for every chunk: Yahoo's consent/cookie handshake
+    # runs once instead of per Ticker, connections are reused, and its
+    # worker pool caps the number of requests in flight against rate limits
+    try:
+        session = initialize_session(asynchronous=True, max_workers=MAX_WORKERS)
+    except Exception as e:
+        logger.info(f"Shared session setup failed, using one per chunk: {e}")
+        session = None
 
-        except Exception as e:
-            logger.info(f"Error processing chunk {current_chunk_idx}: {e}")
+    # Network-bound: fan out every request, then update the UI from this thread
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for idx, chunk in enumerate(chunks):
+            futures[executor.submit(fetch_chunk_fundamentals, chunk, session)] = (fundamentals, idx)
+            futures[executor.submit(fetch_chunk_history, chunk, session)] = (histories, idx)
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            results, idx = futures[future]
+            status_text.text(f"Scanning {len(tickers)} tickers ({done}/{len(futures)} requests)...")
+            progress_bar.progress(done / len(futures))
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                logger.info(f"Error fetching chunk {idx + 1}: {e}")
+
+    # Assemble in ticker order once everything has arrived
+    all_data = []
+    for idx, chunk in enumerate(chunks):
+        if fundamentals[idx] is None or histories[idx] is None:
             continue
+        try:
+            technicals = compute_technicals(histories[idx], chunk)
+            all_data.append(pd.concat([fundamentals[idx], technicals], axis=1))
+        except Exception as e:
+            logger.info(f"Error processing chunk {idx + 1}: {e}")
 
     # Cleanup UI
     progress_bar.empty()
@@ -184,118 +279,127 @@ def fetch_screener_data(tickers, limit=None):
     if not all_data:
         return pd.DataFrame()
         
-    # Combine all chunks
-    full_df = pd.concat(all_data)
-    return full_df.dropna(subset=['Price'])
+    # Combine all chunks, then add the placeholder column and set dtypes once
+    full_df = pd.concat(all_data).dropna(subset=['Price'])
+    full_df.insert(full_df.columns.get_loc('Change%') + 1, 'PreMkt%', 0.0)  # Not available without live feed
+    return full_df.astype({col: np.float64 if col in EXACT_COLUMNS else np.float32 for col in full_df.columns})
+
+def _top_rows(df, col, ascending=False, n=40):
+    """
+    Equivalent of df.sort_values(col, ascending).head(n) using a partial sort.
+
+    nlargest/nsmallest skip missing values, so rows without `col` fill any
+    remaining slots at the end, where sort_values would have placed them.
+    """
+    if len(df) <= n:
+        return df.sort_values(col, ascending=ascending)
+    ranked = df.nsmallest(n, col) if ascending else df.nlargest(n, col)
+    if len(ranked) < n:
+        ranked = pd.concat([ranked, df[df[col].isna()].head(n - len(ranked))])
+    return ranked
+
+# Strategy presets: name -> (mask builder, sort column, ascending).
+# Each builder is called with col(name), which returns that column as a
+# NumPy array, so masks combine plain arrays with no index alignment.
+STRATEGY_RULES = {
+    # High Volatility (HV > 30), Uptrend (Price > SMA50), Pullback (RSI < 55)
+    # RSI > 30: Don't catch falling knives perfectly
+    "Cash Secured Puts (CSP)": (
+        lambda col: (col('HV_20') > 30) & (col('Price') > col('SMA50')) & (col('RSI') < 55) & (col('RSI') > 30),
+        'HV_20', False,
+    ),
+    # Moderate Volatility, Strong Trend, RSI Neutral/High
+    "Covered Calls (CC)": (
+        lambda col: (col('HV_20') > 20) & (col('HV_20') < 60) & (col('Price') > col('SMA50')) & (col('RSI') > 50),
+        'DivYield', False,
+    ),
+    # Downtrend, RSI breaking down
+    "Short Momentum": (
+        lambda col: (col('Price') < col('SMA50')) & (col('RSI') < 40),
+        'RSI', True,
+    ),
+    # Strong Uptrend (SMA20? approx by Price/SMA50 gap), RSI Bullish
+    "Mid Momentum": (
+        lambda col: (col('Price') > col('SMA50')) & (col('RSI') > 55) & (col('RSI') < 75),
+        'RSI', False,
+    ),
+    # Low Beta, Dividend, Long Term Uptrend
+    "Safe Long": (
+        lambda col: (col('Beta') < 1.0) & (col('DivYield') > 0.02) & (col('Price') > col('SMA200')),
+        'DivYield', False,
+    ),
+    # "Tao Bull" Swing Strategy
+    # 1. EMA 8 > 21 > 34 > 55 > 89
+    # 2. ADX > 20
+    # 3. AvgVol > 1M
+    # 4. Sort by Stochastic %K Ascending (find the ones pulling back)
+    "Ultimate Stacked Bulls": (
+        lambda col: (
+            (col('EMA8') > col('EMA21')) & (col('EMA21') > col('EMA34')) &
+            (col('EMA34') > col('EMA55')) & (col('EMA55') > col('EMA89')) &
+            (col('ADX') > 20) & (col('AvgVol') > 1_000_000)
+        ),
+        'StochK', True,
+    ),
+    # "Premarket Screener" / Intraday Runner
+    # 1. Float < 50M
+    # 2. Price < $20
+    # 3. Change% > 20% OR PreMkt% > 20%
+    # 4. RVOL (Volume / AvgVol) > 4.0
+    "Day Trade Runners": (
+        lambda col: (
+            (col('Float') < 50_000_000) & (col('Price') < 20.0) &
+            (col('Volume') / col('AvgVol') > 4.0) &
+            ((col('Change%') > 20.0) | (col('PreMkt%') > 20.0))
+        ),
+        'Change%', False,
+    ),
+    # Stocks exhibiting strong fundamentals and momentum, per the Navellier
+    # 'A' methodology: ROE > 5%, Operating Margins > 5%, positive sales
+    # growth, and Price > SMA50 as the technical confirmation.
+    # Missing fundamentals compare False, so they fail the screen
+    "Navellier A-Rated Growth": (
+        lambda col: (
+            (col('ROE') > 0.05) & (col('OpMargin') > 0.05) &
+            (col('RevGrowth') > 0.0) & (col('Price') > col('SMA50'))
+        ),
+        'RevGrowth', False,
+    ),
+}
+
+# Strategies whose results carry the RVOL column
+RVOL_STRATEGIES = {"Day Trade Runners", "Navellier A-Rated Growth"}
 
-def apply_strategy(df, strategy):
+def apply_strategy(df, strategy, columns=None):
     """
     Filter DataFrame based on strategy presets.
+
+    Presets are looked up in STRATEGY_RULES instead of walking an if/elif
+    chain, and the input frame is only read, never copied.
+
+    Args:
+        df: Screener data from fetch_screener_data
+        strategy: Name of a preset in STRATEGY_RULES
+        columns: Optional list of columns to return; the projection is taken
+            from the (at most 40) result rows rather than the full universe
     """
     if df.empty: return df
-    
-    filtered = df.copy()
-    
-    if strategy == "Cash Secured Puts (CSP)":
-        # Strategy: High Volatility (HV > 40), Uptrend (Price > SMA50), Pullback (RSI < 50)
-        mask = (
-            (filtered['HV_20'] > 30) & 
-            (filtered['Price'] > filtered['SMA50']) & 
-            (filtered['RSI'] < 55) & 
-            (filtered['RSI'] > 30) # Don't catch falling knives perfectly
-        )
-        filtered = filtered[mask].sort_values('HV_20', ascending=False)
-        
-    elif strategy == "Covered Calls (CC)":
-        # Strategy: Moderate Volatility, Strong Trend, RSI Neutral/High
-        mask = (
-            (filtered['HV_20'] > 20) & 
-            (filtered['HV_20'] < 60) &
-            (filtered['Price'] > filtered['SMA50']) &
-            (filtered['RSI'] > 50)
-        )
-        filtered = filtered[mask].sort_values('DivYield', ascending=False)
-        
-    elif strategy == "Short Momentum":
-        # Strategy: Downtrend, RSI breaking down
-        mask = (
-            (filtered['Price'] < filtered['SMA50']) &
-            (filtered['RSI'] < 40)
-        )
-        filtered = filtered[mask].sort_values('RSI', ascending=True)
-        
-    elif strategy == "Mid Momentum":
-        # Strategy: Strong Uptrend (SMA20? approx by Price/SMA50 gap), RSI Bullish
-        mask = (
-            (filtered['Price'] > filtered['SMA50']) &
-            (filtered['RSI'] > 55) & (filtered['RSI'] < 75)
-        )
-        filtered = filtered[mask].sort_values('RSI', ascending=False)
-        
-    elif strategy == "Safe Long":
-        # Strategy: Low Beta, Dividend, Long Term Uptrend
-        mask = (
-            (filtered['Beta'] < 1.0) &
-            (filtered['DivYield'] > 0.02) &
-            (filtered['Price'] > filtered['SMA200'])
-        )
-        filtered = filtered[mask].sort_values('DivYield', ascending=False)
-        
-    elif strategy == "Ultimate Stacked Bulls": 
-        # "Tao Bull" Swing Strategy
-        # 1. EMA 8 > 21 > 34 > 55 > 89
-        # 2. ADX > 20
-        # 3. AvgVol > 1M
-        # 4. Sort by Stochastic %K Ascending
-        
-        # Check alignment
-        aligned = (
-            (filtered['EMA8'] > filtered['EMA21']) &
-            (filtered['EMA21'] > filtered['EMA34']) &
-            (filtered['EMA34'] > filtered['EMA55']) &
-            (filtered['EMA55'] > filtered['EMA89'])
-        )
-        
-        mask = (
-            aligned &
-            (filtered['ADX'] > 20) &
-            (filtered['AvgVol'] > 1_000_000)
-        )
-        filtered = filtered[mask].sort_values('StochK', ascending=True) # Find the ones pulling back
-        
-    elif strategy == "Day Trade Runners":
-        # "Premarket Screener" / Intraday Runner
-        # 1. Float < 50M
-        # 2. Price < $20
-        # 3. Change% > 20% OR PreMkt% > 20%
-        # 4. RVOL > 4.0
-        
-        # Calculate RVOL if not present? We fetched Volume and AvgVol
-        # RVOL = Volume / AvgVol
-        filtered['RVOL'] = filtered['Volume'] / filtered['AvgVol']
-        
-        mask = (
-            (filtered['Float'] < 50_000_000) &
-            (filtered['Price'] < 20.0) &
-            (filtered['RVOL'] > 4.0) &
-            ((filtered['Change%'] > 20.0) | (filtered['PreMkt%'] > 20.0))
-        )
-        filtered = filtered[mask].sort_values('Change%', ascending=False)
-        
-    elif strategy == "Navellier A-Rated Growth":
-        # Screen for stocks exhibiting strong fundamentals and momentum
-        # Criteria match the Navellier 'A' methodology
-        # Technical confirmation: Price > SMA50 (Uptrend) and RSI > 50 (Momentum)
-        
-        if 'RVOL' not in filtered:
-            filtered['RVOL'] = filtered['Volume'] / filtered['AvgVol']
-            
-        mask = (
-            (filtered['ROE'].fillna(0) > 0.05) &              # Return on equity > 5%
-            (filtered['OpMargin'].fillna(0) > 0.05) &         # Operating Margins > 5%
-            (filtered['RevGrowth'].fillna(0) > 0.0) &         # Positive Sales growth
-            (filtered['Price'] > filtered['SMA50'])           # Positive Trend
-        )
-        filtered = filtered[mask].sort_values('RevGrowth', ascending=False)
-
-    return filtered.head(40) # Return top 40 results
+
+    rule = STRATEGY_RULES.get(strategy)
+    if rule is None:
+        result = df.head(40) # Return top 40 results
+    else:
+        build_mask, sort_col, ascending = rule
+
+        def col(name):
+            return df[name].to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mask = build_mask(col)
+
+        filtered = df[mask]
+        if strategy in RVOL_STRATEGIES:
+            filtered = filtered.assign(RVOL=filtered['Volume'] / filtered['AvgVol'])
+        result = _top_rows(filtered, sort_col, ascending=ascending)
+
+    return result[columns] if columns else result
@@ -12,17 +12,46 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import streamlit as st
+from services.cache import disk_cache
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
-def fetch_sector_data(ticker, start_date, end_date):
-    """Cached data fetching for sector ETFs."""
-    data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
-    return data
+@disk_cache(ttl=3600)  # Same TTL, but survives app restarts
+def fetch_sector_data(tickers, start_date, end_date):
+    """
+    Cached data fetching for sector ETFs.
+
+    Downloads a tuple of tickers in one request.
+
+    Returns:
+        dict of {ticker: OHLCV DataFrame}; tickers that came back empty are
+        left out, so a failed download returns {}
+    """
+    try:
+        data = yf.download(
+            list(tickers), start=start_date, end=end_date,
+            group_by='ticker', threads=True, progress=False
+        )
+    except Exception as e:
+        logger.info(f"Error fetching sector data: {e}")
+        return {}
+    if data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        # Some yfinance versions return flat columns for a single ticker
+        return {tickers[0]: data} if len(tickers) == 1 else {}
+
+    available = set(data.columns.get_level_values(0))
+    frames = {}
+    for ticker in tickers:
+        if ticker in available:
+            # Other tickers' trading days show up as all-NaN rows
+            frame = data[ticker].dropna(how='all')
+            if not frame.empty:
+                frames[ticker] = frame
+    return frames
 
 
 # 11 Select Sector SPDR ETFs
@@ -48,73 +77,76 @@ TIMEFRAMES = {
     'Long-term': 252    # ~1 year
 }
 
+# SEAF categories, best first
+CATEGORIES = ['Favored', 'Neutral', 'Avoid']
 
-def calculate_asset_flow_score(sector_data, spy_data, period):
+
+def _tail_matrix(frames, column, length):
+    """
+    Stacks the last `length` values of `column` from each frame into a
+    (length, n_frames) array, aligned on the most recent row. Shorter
+    histories are padded with NaN at the top.
+    """
+    out = np.full((length, len(frames)), np.nan)
+    for j, frame in enumerate(frames):
+        values = frame[column].to_numpy(dtype=np.float64)[-length:]
+        out[length - len(values):, j] = values
+    return out
+
+
+def calculate_asset_flow_scores(sector_data, spy_data, timeframes=TIMEFRAMES):
     """
-    Calculate composite asset flow score for a sector over a given period.
+    Calculate composite asset flow scores for every sector and timeframe at once.
     
     Combines:
     1. Volume-weighted price momentum (captures actual money flow)
     2. Relative strength vs SPY (performance comparison)
     
-    Higher score = stronger inflows
+    Higher score = stronger inflows. Each sector uses its own most recent
+    rows, so the result matches scoring the sectors one by one.
     
     Args:
-        sector_data: DataFrame with sector ETF historical data
+        sector_data: dict of {ticker: DataFrame} with sector ETF historical data
         spy_data: DataFrame with SPY historical data (benchmark)
-        period: Number of days to analyze
+        timeframes: dict of {timeframe name: number of days to analyze}
         
     Returns:
-        float: Composite asset flow score
+        DataFrame indexed by ticker with one '{timeframe}_Score' column per
+        timeframe; sectors without enough history score 0
     """
-    try:
-        # Ensure we have enough data
-        if len(sector_data) < period or len(spy_data) < period:
-            return 0
-        
-        # Get recent data
-        recent_sector = sector_data.iloc[-period:]
-        recent_spy = spy_data.iloc[-period:]
+    tickers = list(sector_data)
+    frames = list(sector_data.values())
+    max_period = max(timeframes.values())
+    
+    close = _tail_matrix(frames, 'Close', max_period)
+    volume = _tail_matrix(frames, 'Volume', max_period)
+    lengths = np.array([len(frame) for frame in frames])
+    spy_close = spy_data['Close'].to_numpy(dtype=np.float64) if len(spy_data) else np.empty(0)
+    
+    scores = {}
+    for tf_name, period in timeframes.items():
+        recent_close = close[-period:]
+        recent_volume = volume[-period:]
         
         # 1. Volume-weighted price momentum
-        # Calculate daily returns weighted by volume
-        price_change = recent_sector['Close'].pct_change()
-        volume_norm = recent_sector['Volume'] / recent_sector['Volume'].mean()
-        vwpm = (price_change * volume_norm).sum()
+        # Daily returns weighted by volume relative to its mean over the window
+        price_change = recent_close[1:] / recent_close[:-1] - 1
+        volume_norm = recent_volume[1:] / recent_volume.mean(axis=0)
+        vwpm = np.nansum(price_change * volume_norm, axis=0)
         
         # 2. Relative strength vs SPY
-        sector_return = (recent_sector['Close'].iloc[-1] / recent_sector['Close'].iloc[0] - 1)
-        spy_return = (recent_spy['Close'].iloc[-1] / recent_spy['Close'].iloc[0] - 1)
+        sector_return = recent_close[-1] / recent_close[0] - 1
+        spy_return = spy_close[-1] / spy_close[-period] - 1 if len(spy_close) >= period else np.nan
         relative_strength = sector_return - spy_return
         
         # Composite score (equal weight to both components)
         composite_score = (vwpm * 0.5) + (relative_strength * 0.5)
         
-        return composite_score
-    
-    except Exception as e:
-        return 0
-
-
-def rank_sectors_by_flow(sector_scores):
-    """
-    Rank sectors based on asset flow scores.
-    
-    Args:
-        sector_scores: dict of {ticker: score}
-        
-    Returns:
-        dict of {ticker: rank} where 1 = highest flows, 11 = lowest flows
-    """
-    # Sort by score descending (highest flows first)
-    sorted_sectors = sorted(sector_scores.items(), key=lambda x: x[1], reverse=True)
-    
-    # Assign ranks
-    ranks = {}
-    for rank, (ticker, score) in enumerate(sorted_sectors, start=1):
-        ranks[ticker] = rank
+        # Ensure we have enough data
+        enough_data = (lengths >= period) & (len(spy_close) >= period)
+        scores[f'{tf_name}_Score'] = np.where(enough_data, composite_score, 0)
     
-    return ranks
+    return pd.DataFrame(scores, index=tickers)
 
 
 def get_seaf_model():
@@ -134,53 +166,43 @@ def get_seaf_model():
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        sector_data = {}
-        
-        # Download all sector ETFs using cached function
-        for ticker in SECTOR_ETFS.keys():
-            sector_data[ticker] = fetch_sector_data(ticker, start_str, end_str)
-        
-        # Download SPY benchmark
-        spy_data = fetch_sector_data('SPY', start_str, end_str)
-        
-        # Calculate asset flow scores and ranks for each timeframe
-        results = []
-        
-        for ticker, sector_name in SECTOR_ETFS.items():
-            row = {
-                'Ticker': ticker,
-                'Sector': sector_name
-            }
-            
-            # Calculate scores for each timeframe
-            for tf_name, tf_days in TIMEFRAMES.items():
-                score = calculate_asset_flow_score(
-                    sector_data[ticker], 
-                    spy_data, 
-                    tf_days
-                )
-                row[f'{tf_name}_Score'] = score
-            
-            results.append(row)
-        
-        df = pd.DataFrame(results)
-        
-        # Rank sectors for each timeframe
-        for tf_name in TIMEFRAMES.keys():
-            scores = dict(zip(df['Ticker'], df[f'{tf_name}_Score']))
-            ranks = rank_sectors_by_flow(scores)
-            df[tf_name] = df['Ticker'].map(ranks)
+        # Download all sector ETFs and the SPY benchmark in one cached request
+        sector_data = fetch_sector_data(tuple(SECTOR_ETFS) + ('SPY',), start_str, end_str)
+        spy_data = sector_data.get('SPY', pd.DataFrame())
+        
+        # Calculate asset flow scores for every sector and timeframe
+        scores = calculate_asset_flow_scores(
+            {ticker: sector_data.get(ticker, pd.DataFrame(columns=['Close', 'Volume'])) for ticker in SECTOR_ETFS},
+            spy_data
+        )
+        
+        df = pd.DataFrame({
+            'Ticker': list(SECTOR_ETFS),
+            'Sector': list(SECTOR_ETFS.values()),
+            **{col: scores[col].to_numpy() for col in scores.columns}
+        })
+        
+        # Rank sectors for each timeframe: 1 = highest flows, 11 = lowest flows
+        # Ties keep listing order, matching a stable descending sort
+        df[list(TIMEFRAMES)] = (
+            df[[f'{tf_name}_Score' for tf_name in TIMEFRAMES]]
+            .rank(ascending=False, method='first', na_option='bottom')
+            .astype('int8')
+            .to_numpy()
+        )
         
         # Calculate total score (sum of all ranks)
         # Lower score = better (more inflows across timeframes)
         rank_columns = list(TIMEFRAMES.keys())
-        df['Total_Score'] = df[rank_columns].sum(axis=1)
+        df['Total_Score'] = df[rank_columns].sum(axis=1).astype('int8')
         
         # Categorize based on total score
         # With 4 timeframes: range is 4-44
         # Favored: 4-20, Neutral: 21-32, Avoid: 33-44
-        df['Category'] = df['Total_Score'].apply(lambda x: 
-            'Favored' if x <= 20 else ('Neutral' if x <= 32 else 'Avoid')
+        total = df['Total_Score'].to_numpy()
+        df['Category'] = pd.Categorical(
+            np.select([total <= 20, total <= 32], ['Favored', 'Neutral'], default='Avoid'),
+            categories=CATEGORIES, ordered=True
         )
         
         # Sort by total score (best first)
@@ -0,0 +1,135 @@
+"""
+Multi-strategy analysis pipeline behind the Stock Analysis tabs.
+
+Runs the Power Gauge, Weinstein Stage and CANSLIM checks for a ticker and
+stores the results in st.session_state.analysis_data.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import streamlit as st
+
+from canslim import get_canslim_metrics
+from power_gauge import calculate_power_gauge
+from weinstein import get_weinstein_stage
+from services.logger import setup_logger
+logger = setup_logger(__name__)
+
+def initialize_analysis_state():
+    if 'analysis_data' not in st.session_state:
+        st.session_state.analysis_data = {
+            'ticker': None,
+            'power_gauge': None,
+            'weinstein': None,
+            'canslim': None,
+            'timestamp': None
+        }
+
+# Pipeline results are cached per ticker and day, so switching back to a
+# ticker seen earlier (in any session) skips the fetch entirely
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_power_gauge(ticker_symbol, day):
+    return calculate_power_gauge(ticker_symbol)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_weinstein(ticker_symbol, day):
+    return get_weinstein_stage(ticker_symbol)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_canslim(ticker_symbol, day):
+    return get_canslim_metrics(ticker_symbol)
+
+# Analysis modules run by the pipeline: key -> (name, start message, failure message, function)
+ANALYSIS_STEPS = {
+    'power_gauge': ("Power Gauge", "⚡ Computing Power Gauge (20-Factor Model)...", "⚠️ Power Gauge failed.", _cached_power_gauge),
+    'weinstein': ("Weinstein Stage", "📉 Identifying Weinstein Stage...", "⚠️ Weinstein Stage failed.", _cached_weinstein),
+    'canslim': ("CANSLIM", "🚀 Checking CANSLIM Factors...", "⚠️ CANSLIM failed.", _cached_canslim),
+}
+
+# Tickers whose analysis failed are not retried on ordinary reruns for this long
+FAILURE_TTL = 300
+
+@st.cache_resource
+def recent_failures():
+    """Shared ticker -> retry time (time.monotonic) map of recently failed analyses."""
+    return {}
+
+def clear_analysis_failure(ticker_symbol):
+    """Lets the next pipeline run for `ticker_symbol` fetch again; used by the Retry buttons."""
+    recent_failures().pop(ticker_symbol, None)
+
+def analysis_failed(result):
+    """Modules return None or an {'error': ...} dict when they fail."""
+    return not result or (isinstance(result, dict) and 'error' in result)
+
+def run_analysis_pipeline(ticker_symbol):
+    """Orchestrates fetching data for all strategy modules."""
+    initialize_analysis_state()
+    
+    # Check if we already have valid data for this ticker
+    current_data = st.session_state.analysis_data
+    if current_data['ticker'] == ticker_symbol and current_data['power_gauge'] is not None:
+        return
+    
+    # The ticker failed recently (in any session); don't hammer a rate-limited
+    # source. Show it as unavailable until the TTL passes or Retry clears it.
+    failures = recent_failures()
+    if failures.get(ticker_symbol, 0) > time.monotonic():
+        if current_data['ticker'] != ticker_symbol:
+            st.session_state.analysis_data = {
+                'ticker': ticker_symbol,
+                'power_gauge': None,
+                'weinstein': None,
+                'canslim': None,
+                'timestamp': None
+            }
+        return
+
+    # Create a status container
+    # Provide a spinner since st.status is new in Streamlit 1.25.0, assuming support but fallback to plain spinner if needed.
+    # We'll use st.status as it's cleaner.
+    try:
+        with st.status(f"Running Multi-Strategy Analysis for {ticker_symbol}...", expanded=True) as status:
+            # The three analyses fetch independent data, so run them together
+            # and report each one as it finishes
+            results = {}
+            day = datetime.now().strftime('%Y-%m-%d')
+            with ThreadPoolExecutor(max_workers=len(ANALYSIS_STEPS)) as executor:
+                futures = {}
+                for key, (_, start_msg, _, func) in ANALYSIS_STEPS.items():
+                    status.write(start_msg)
+                    futures[executor.submit(func, ticker_symbol, day)] = key
+                
+                for future in as_completed(futures):
+                    key = futures[future]
+                    name, _, fail_msg, _ = ANALYSIS_STEPS[key]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        logger.error(f"{name} failed for {ticker_symbol}: {e}")
+                        results[key] = None
+                    if analysis_failed(results[key]):
+                        status.write(fail_msg)
+                        # Drop the cached failure so a retry refetches
+                        ANALYSIS_STEPS[key][3].clear(ticker_symbol, day)
+            
+            if any(analysis_failed(result) for result in results.values()):
+                failures[ticker_symbol] = time.monotonic() + FAILURE_TTL
+            else:
+                failures.pop(ticker_symbol, None)
+            
+            # Update State
+            st.session_state.analysis_data = {
+                'ticker': ticker_symbol,
+                'power_gauge': results['power_gauge'],
+                'weinstein': results['weinstein'],
+                'canslim': results['canslim'],
+                'timestamp': datetime.now()
+            }
+            
+            status.update(label="Analysis Complete!", state="complete", expanded=False)
+            
+    except Exception as e:
+        st.error(f"Error running analysis pipeline: {e}")
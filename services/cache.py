@@ -0,0 +1,156 @@
+"""
+Persistent on-disk cache for slow network fetches.
+
+Sits underneath @st.cache_data so fetched data survives process restarts:
+Streamlit's in-memory cache serves repeat calls within a process, and this
+layer serves the first call after a restart from disk while still fresh.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import pandas as pd
+from services.logger import setup_logger
+logger = setup_logger(__name__)
+
+CACHE_DIR = '.cache'
+
+# Files untouched for longer than the largest TTL in use (a day) are swept
+# away; the sweep runs at most once per SWEEP_INTERVAL per process
+MAX_AGE = 2 * 24 * 3600
+SWEEP_INTERVAL = 3600
+_sweep_state = {'last': None, 'lock': threading.Lock()}
+
+
+def _cache_paths(func, args, kwargs):
+    """Returns (data_path, meta_path) for one call, grouped by ticker when known."""
+    raw = repr((func.__module__, func.__qualname__, args, sorted(kwargs.items())))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    # Single-ticker fetches get their own folder; everything else is shared
+    group = args[0] if args and isinstance(args[0], str) else '_shared'
+    group = ''.join(ch if ch.isalnum() or ch in '-_.' else '_' for ch in group)
+
+    base = os.path.join(CACHE_DIR, group, f'{func.__name__}_{digest}')
+    return base + '.pkl', base + '.meta.json'
+
+
+def _is_empty(result):
+    """Failed fetches come back empty; those are never persisted."""
+    if result is None:
+        return True
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.empty
+    if isinstance(result, tuple):
+        # Multi-part results are only stored when every part came back
+        return len(result) == 0 or any(_is_empty(part) for part in result)
+    if isinstance(result, (dict, list)):
+        return len(result) == 0
+    return False
+
+
+def _remove_entry(data_path, meta_path):
+    """Deletes one entry's files, ignoring any that are already gone."""
+    for path in (meta_path, data_path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def sweep_cache(max_age=MAX_AGE):
+    """
+    Deletes cache files older than `max_age` seconds and any emptied folders.
+
+    Expired entries are also removed when they are read, but entries for
+    tickers nobody asks about again would otherwise stay on disk forever.
+
+    Returns:
+        Number of files removed
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for root, _, files in os.walk(CACHE_DIR, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        if root != CACHE_DIR:
+            try:
+                os.rmdir(root)  # Only succeeds once the folder is empty
+            except OSError:
+                pass
+    return removed
+
+
+def _maybe_sweep():
+    """Runs sweep_cache if this process has not swept in the last SWEEP_INTERVAL."""
+    now = time.monotonic()
+    with _sweep_state['lock']:
+        if _sweep_state['last'] is not None and now - _sweep_state['last'] < SWEEP_INTERVAL:
+            return
+        _sweep_state['last'] = now
+    try:
+        sweep_cache()
+    except Exception as e:
+        logger.info(f"Disk cache sweep failed: {e}")
+
+
+def disk_cache(ttl):
+    """
+    Decorator that pickles a function's result to disk for `ttl` seconds.
+
+    Entries live at .cache/{ticker}/{function}_{md5}.pkl next to a
+    .meta.json file holding the write timestamp. Unreadable or expired
+    entries are deleted and refetched; empty results are returned but not
+    stored. Each write also triggers the periodic sweep of stale files.
+
+    Args:
+        ttl: Time to live in seconds
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            data_path, meta_path = _cache_paths(func, args, kwargs)
+
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                if time.time() - meta['timestamp'] < ttl:
+                    with open(data_path, 'rb') as f:
+                        return pickle.load(f)
+                _remove_entry(data_path, meta_path)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, pickle.UnpicklingError, EOFError):
+                _remove_entry(data_path, meta_path)
+
+            result = func(*args, **kwargs)
+            if _is_empty(result):
+                return result
+
+            try:
+                os.makedirs(os.path.dirname(data_path), exist_ok=True)
+                # Write to temp files and swap in so readers never see partial data
+                with open(data_path + '.tmp', 'wb') as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(data_path + '.tmp', data_path)
+                with open(meta_path + '.tmp', 'w') as f:
+                    json.dump({'timestamp': time.time(), 'function': func.__qualname__}, f)
+                os.replace(meta_path + '.tmp', meta_path)
+            except Exception as e:
+                logger.info(f"Disk cache write failed for {func.__name__}: {e}")
+
+            _maybe_sweep()
+            return result
+        return wrapper
+    return decorator
@@ -1,22 +1,30 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
+from services.cache import disk_cache
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
 @st.cache_data(ttl=300) # Cache for 5 minutes
-def fetch_stock_history(symbol):
+@disk_cache(ttl=300) # Same TTL, but survives app restarts
+def fetch_stock_history(symbol, period="2y"):
     try:
         # Use Ticker object for better reliability than download()
         stock = yf.Ticker(symbol)
-        df = stock.history(period="2y", interval="1d")
+        df = stock.history(period=period, interval="1d")
         return df
     except Exception as e:
         logger.info(f"Error fetching {symbol}: {e}")
         return pd.DataFrame()
 
 @st.cache_data(ttl=3600) # Cache for 1 hour
+@disk_cache(ttl=3600) # Same TTL, but survives app restarts
 def fetch_stock_info(symbol):
+    """Shared cached `yf.Ticker(symbol).info` so each symbol is fetched once per hour."""
     try:
         stock = yf.Ticker(symbol)
         return stock.info
@@ -24,6 +32,65 @@ def fetch_stock_info(symbol):
         logger.info(f"Error fetching info for {symbol}: {e}")
         return {}
 
+def fetch_chains_concurrently(ticker, expirations):
+    """
+    Fetches option chains for several expirations in parallel.
+    
+    Each expiration is a separate blocking HTTPS round-trip, so the requests
+    are issued from a thread pool and wall time is roughly one round-trip.
+    
+    Args:
+        ticker: yf.Ticker instance
+        expirations: Sequence of expiration date strings
+        
+    Returns:
+        List of (calls, puts, exp_date) tuples in expiration order.
+        Expirations that fail to download are skipped.
+    """
+    if not expirations:
+        return []
+    
+    def _fetch_one(exp_date):
+        chain = ticker.option_chain(exp_date)
+        return chain.calls, chain.puts, exp_date
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(expirations)) as executor:
+        futures = {executor.submit(_fetch_one, exp_date): exp_date for exp_date in expirations}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                continue
+    
+    return [results[exp_date] for exp_date in expirations if exp_date in results]
+
+def downcast_columns(df, float_cols=(), int_cols=()):
+    """
+    Downcasts fetched numeric columns in place to shrink cached frames.
+    
+    Columns are matched by name, or by the last level of MultiIndex columns.
+    Prices become float32; counts become int32, or float32 when they hold NaN.
+    """
+    for col in df.columns:
+        field = col[-1] if isinstance(col, tuple) else col
+        if field in float_cols:
+            df[col] = df[col].astype(np.float32)
+        elif field in int_cols:
+            dtype = np.int32 if df[col].notna().all() else np.float32
+            df[col] = df[col].astype(dtype)
+    return df
+
+@lru_cache(maxsize=1)
+def load_tickers_csv():
+    """
+    Parses tickers.csv once per process.
+    
+    Both the ticker picker and the screener universe derive from this frame,
+    so the CSV is read from disk a single time. Callers must not mutate it.
+    """
+    return pd.read_csv('tickers.csv', usecols=lambda col: col in ('Symbol', 'Ticker', 'Security'))
+
 @st.cache_data(ttl=86400) # Cache for 24 hours
 def get_ticker_options():
     # Common ETFs/Indices not in S&P 500 list
@@ -54,7 +121,7 @@ def get_ticker_options():
     
     try:
         # Load S&P 500 constituents
-        df = pd.read_csv('tickers.csv')
+        df = load_tickers_csv()
         # Format: "AAPL - Apple Inc."
         stocks = (df['Symbol'] + " - " + df['Security']).tolist()
         return etfs + sorted(stocks)
@@ -62,34 +129,64 @@ def get_ticker_options():
         logger.info(f"Error loading tickers list: {e}")
         return etfs # Fallback if csv missing
 
+# The mphinancial EMA stack
+EMA_SPANS = (8, 21, 34, 55, 89)
+
+def ema_stack(close, spans=EMA_SPANS):
+    """
+    Computes several EMAs (adjust=False) of one price array.
+    
+    The recursions run in pandas' compiled ewm over a single shared float64
+    buffer, and the results land in one preallocated (n, len(spans)) array
+    so the caller can assign every EMA column at once.
+    """
+    close = pd.Series(np.asarray(close, dtype=np.float64), copy=False)
+    out = np.empty((len(close), len(spans)))
+    for k, span in enumerate(spans):
+        out[:, k] = close.ewm(span=span, adjust=False).mean().to_numpy()
+    return out
+
+def _rolling_mean(values, window):
+    """
+    Trailing rolling mean over a 1-D array using zero-copy window views.
+    
+    Matches pandas rolling semantics: the first `window - 1` entries, and any
+    window containing NaN, are NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
 def calculate_mphinancial_mechanics(df):
-    import numpy as np # Local import since it's only used here
+    h = df['High'].to_numpy(dtype=np.float64).reshape(-1)
+    l = df['Low'].to_numpy(dtype=np.float64).reshape(-1)
+    c = df['Close'].to_numpy(dtype=np.float64).reshape(-1)
+    
     # 1. The EMA Stack (The mphinancial Core)
-    for p in [8, 21, 34, 55, 89]:
-        df[f'EMA{p}'] = df['Close'].ewm(span=p, adjust=False).mean()
+    df[[f'EMA{p}' for p in EMA_SPANS]] = ema_stack(c)
     
     # 2. The 200 SMA (The Wind)
     df['SMA200'] = df['Close'].rolling(window=200).mean()
     
     # 3. ADX (Trend Strength) - Manual Calculation for Chromebook Compatibility
     n = 14
-    h = df['High'].values.flatten()
-    l = df['Low'].values.flatten()
-    c = df['Close'].values.flatten()
     
     # Vectorized DM calculation
     plus_dm = np.insert(np.where((h[1:] - h[:-1]) > (l[:-1] - l[1:]), np.maximum(h[1:] - h[:-1], 0), 0), 0, 0)
     minus_dm = np.insert(np.where((l[:-1] - l[1:]) > (h[1:] - h[:-1]), np.maximum(l[:-1] - l[1:], 0), 0), 0, 0)
     tr = np.insert(np.maximum(h[1:] - l[1:], np.maximum(abs(h[1:] - c[:-1]), abs(l[1:] - c[:-1]))), 0, 0)
     
-    # Ensure Series are 1D to prevent dimension errors
-    atr_series = pd.Series(tr, index=df.index).rolling(window=n).mean()
-    plus_di = 100 * (pd.Series(plus_dm, index=df.index).rolling(window=n).mean() / atr_series)
-    minus_di = 100 * (pd.Series(minus_dm, index=df.index).rolling(window=n).mean() / atr_series)
+    # Rolling means run on the arrays directly; no intermediate Series
+    atr = _rolling_mean(tr, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * (_rolling_mean(plus_dm, n) / atr)
+        minus_di = 100 * (_rolling_mean(minus_dm, n) / atr)
+        di_spread = np.abs(plus_di - minus_di) / (plus_di + minus_di)
     
     # Handle division by zero/NaN for DX calculation
-    dx = 100 * (abs(plus_di - minus_di) / (plus_di + minus_di)).fillna(0)
+    dx = 100 * np.where(np.isnan(di_spread), 0.0, di_spread)
     
-    df['ADX'] = dx.rolling(window=n).mean()
-    df['ATR'] = atr_series
+    df['ADX'] = _rolling_mean(dx, n)
+    df['ATR'] = atr
     return df
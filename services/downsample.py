@@ -0,0 +1,72 @@
+"""
+Largest-Triangle-Three-Buckets (LTTB) downsampling for chart traces.
+
+Keeps the visual shape of long time series while sending the browser
+roughly one point per horizontal pixel.
+"""
+
+import numpy as np
+
+# Traces longer than this are downsampled before plotting
+MAX_CHART_POINTS = 2000
+
+
+def lttb_indices(y, n_out):
+    """
+    Selects the indices of `n_out` points that best preserve the shape of `y`.
+
+    Points are treated as evenly spaced. The first and last points are always
+    kept; each bucket in between keeps the point forming the largest triangle
+    with the previously kept point and the next bucket's average.
+
+    Args:
+        y: 1-D array of values without NaN
+        n_out: Number of points to keep
+
+    Returns:
+        np.ndarray of sorted integer indices into y
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    out = np.empty(n_out, dtype=np.intp)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+
+    return out
+
+
+def downsample_series(series, max_points=MAX_CHART_POINTS):
+    """
+    LTTB-downsamples a pandas Series for plotting when it exceeds `max_points`.
+
+    Shorter series are returned unchanged. Longer ones drop missing values
+    first, since LTTB needs a gap-free series.
+    """
+    if len(series) <= max_points:
+        return series
+    series = series.dropna()
+    return series.iloc[lttb_indices(series.to_numpy(), max_points)]
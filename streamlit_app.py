@@ -1,25 +1,12 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from asbury_metrics import get_asbury_6_signals, get_asbury_6_historical
-from seaf_model import get_seaf_model, get_top_3_sectors
-from gamma_profile import get_gamma_profile
-from options_flow import get_daily_flow_snapshot, analyze_flow_sentiment, get_volatility_analysis
-from fundamental_metrics import fetch_fundamental_data, format_large_number
-from congress_tracker import fetch_congress_members, fetch_stock_disclosures, get_top_traded_tickers, get_active_traders, check_watchlist_overlap
-from macro_analysis import fetch_macro_data, get_yield_curve_data, get_asset_performance, render_yield_curve_chart, render_intermarket_chart
-from screener_engine import get_screener_universe, fetch_screener_data, apply_strategy
-from power_gauge import calculate_power_gauge
-from weinstein import get_weinstein_stage
-from canslim import get_canslim_metrics
+from macro_analysis import fetch_macro_data, get_yield_curve_data
+from services.analysis_pipeline import run_analysis_pipeline
 from services.data_fetcher import get_ticker_options, calculate_mphinancial_mechanics
 from services.logger import setup_logger
 from datetime import datetime
+import importlib
 import re
-import streamlit.components.v1 as components
+import string
 
 logger = setup_logger(__name__)
 
@@ -30,27 +17,24 @@ logger = setup_logger(__name__)
 if 'active_tab' not in st.session_state:
     st.session_state.active_tab = 0
 
+# Manual TradingView mapping for common ETFs/Indices; anything else is assumed NASDAQ
+TV_SYMBOLS = {t: f"AMEX:{t}" for t in ('SPY', 'IWM', 'QQQ', 'DIA', 'GLD', 'SLV', 'TLT')}
+TV_SYMBOLS['VIX'] = "CBOE:VIX"
+TV_SYMBOLS['BTC-USD'] = "COINBASE:BTCUSD"
+
 def get_tv_symbol(ticker):
     """Simple mapping for TradingView symbols."""
     ticker = ticker.upper()
-    # Manual Mapping for common ETFs/Indices
-    if ticker in ['SPY', 'IWM', 'QQQ', 'DIA', 'GLD', 'SLV', 'TLT']:
-        return f"AMEX:{ticker}"
-    if ticker in ['VIX']:
-        return "CBOE:VIX"
-    if ticker in ['BTC-USD']:
-        return "COINBASE:BTCUSD"
     # Default assumption for stocks (imperfect but fast)
-    return f"NASDAQ:{ticker}"
+    return TV_SYMBOLS.get(ticker, f"NASDAQ:{ticker}")
 
-def render_mini_chart_html(symbol, description):
-    """Generates HTML for TradingView Mini Chart widget."""
-    return f"""
+# TradingView Mini Chart widget; only the symbol varies between charts
+MINI_CHART_TEMPLATE = string.Template("""
 <div class="tradingview-widget-container">
   <div class="tradingview-widget-container__widget"></div>
   <script type="text/javascript" src="https://s3.tradingview.com/external-embedding/embed-widget-mini-symbol-overview.js" async>
-  {{
-  "symbol": "{symbol}",
+  {
+  "symbol": "${symbol}",
   "width": "100%",
   "height": "100%",
   "locale": "en",
@@ -59,17 +43,29 @@ def render_mini_chart_html(symbol, description):
   "isTransparent": false,
   "autosize": true,
   "largeChartUrl": ""
-}}
+}
   </script>
 </div>
-"""
+""")
+
+def render_mini_chart_html(symbol, description):
+    """Generates HTML for TradingView Mini Chart widget."""
+    return MINI_CHART_TEMPLATE.substitute(symbol=symbol)
 
 # --- API CALL COUNTER WITH PERSISTENCE ---
+import atexit
 import json
 import os
+import threading
+import time
 
 API_STATS_FILE = "api_stats.json"
 
+# The total is written back every SAVE_EVERY_CALLS calls or SAVE_INTERVAL
+# seconds, whichever comes first, and once more at shutdown
+SAVE_EVERY_CALLS = 25
+SAVE_INTERVAL = 10
+
 def load_total_calls():
     """Load total API calls from persistent storage."""
     if os.path.exists(API_STATS_FILE):
@@ -84,24 +80,53 @@ def load_total_calls():
 def save_total_calls(count):
     """Save total API calls to persistent storage."""
     try:
-        with open(API_STATS_FILE, 'w') as f:
+        # Write to a temp file and swap in so a crash never leaves a partial file
+        with open(API_STATS_FILE + '.tmp', 'w') as f:
             json.dump({'total_calls': count}, f)
+        os.replace(API_STATS_FILE + '.tmp', API_STATS_FILE)
     except IOError as e:
         print(f"Error saving API stats: {e}")
         pass
 
+def flush_api_stats(pending):
+    """Save the pending total if any calls have not been written yet."""
+    with pending['lock']:
+        if pending['unsaved']:
+            save_total_calls(pending['total'])
+            pending['unsaved'] = 0
+            pending['last_save'] = time.monotonic()
+
+@st.cache_resource
+def api_pending():
+    """
+    Process-wide running total shared by every browser session.
+
+    Created once per process, so the shutdown hook is registered once and
+    always flushes the newest total.
+    """
+    pending = {'total': load_total_calls(), 'unsaved': 0, 'last_save': time.monotonic(), 'lock': threading.Lock()}
+    atexit.register(flush_api_stats, pending)
+    return pending
+
 if 'api_calls' not in st.session_state:
     st.session_state.api_calls = 0
     st.session_state.api_reset_time = datetime.now()
 
 if 'total_api_calls' not in st.session_state:
-    st.session_state.total_api_calls = load_total_calls()
+    st.session_state.total_api_calls = api_pending()['total']
 
 def track_api_call():
-    """Increment API call counters and save persistence."""
+    """Increment API call counters and periodically save persistence."""
     st.session_state.api_calls += 1
-    st.session_state.total_api_calls += 1
-    save_total_calls(st.session_state.total_api_calls)
+    
+    pending = api_pending()
+    with pending['lock']:
+        pending['total'] += 1
+        pending['unsaved'] += 1
+        st.session_state.total_api_calls = pending['total']
+        due = pending['unsaved'] >= SAVE_EVERY_CALLS or time.monotonic() - pending['last_save'] > SAVE_INTERVAL
+    if due:
+        flush_api_stats(pending)
 
 # --- THE MPHINANCAL ENGINE ---
 # (Moved to services/data_fetcher.py)
@@ -154,112 +179,110 @@ else:
 ticker = ticker.replace('.', '-')
 
 # --- ANALYSIS STATE MANAGEMENT ---
-def initialize_analysis_state():
-    if 'analysis_data' not in st.session_state:
-        st.session_state.analysis_data = {
-            'ticker': None,
-            'power_gauge': None,
-            'weinstein': None,
-            'canslim': None,
-            'timestamp': None
-        }
-
-def run_analysis_pipeline(ticker_symbol):
-    """Orchestrates fetching data for all strategy modules."""
-    initialize_analysis_state()
-    
-    # Check if we already have valid data for this ticker
-    current_data = st.session_state.analysis_data
-    if current_data['ticker'] == ticker_symbol and current_data['power_gauge'] is not None:
-        return
-
-    # Create a status container
-    # Provide a spinner since st.status is new in Streamlit 1.25.0, assuming support but fallback to plain spinner if needed.
-    # We'll use st.status as it's cleaner.
-    try:
-        with st.status(f"Running Multi-Strategy Analysis for {ticker_symbol}...", expanded=True) as status:
-            # 1. Power Gauge
-            status.write("⚡ Computing Power Gauge (20-Factor Model)...")
-            pg_data = calculate_power_gauge(ticker_symbol)
-            if not pg_data: status.write("⚠️ Power Gauge failed.")
-            
-            # 2. Weinstein Stage
-            status.write("📉 Identifying Weinstein Stage...")
-            w_data = get_weinstein_stage(ticker_symbol)
-            if not w_data: status.write("⚠️ Weinstein Stage failed.")
-            
-            # 3. CANSLIM
-            status.write("🚀 Checking CANSLIM Factors...")
-            c_data = get_canslim_metrics(ticker_symbol)
-            if not c_data: status.write("⚠️ CANSLIM failed.")
-            
-            # Update State
-            st.session_state.analysis_data = {
-                'ticker': ticker_symbol,
-                'power_gauge': pg_data,
-                'weinstein': w_data,
-                'canslim': c_data,
-                'timestamp': datetime.now()
-            }
-            
-            status.update(label="Analysis Complete!", state="complete", expanded=False)
-            
-    except Exception as e:
-        st.error(f"Error running analysis pipeline: {e}")
+# (Moved to services/analysis_pipeline.py)
 
 # Run Pipeline on Ticker Change
 if ticker:
     run_analysis_pipeline(ticker)
 
 # --- WATCHLIST ---
-if 'watchlist' not in st.session_state:
-    st.session_state.watchlist = []
-
-st.sidebar.divider()
-st.sidebar.markdown("### Watchlist")
-
-# Add to watchlist button
-if ticker and ticker not in st.session_state.watchlist:
-    if st.sidebar.button(f"+ Add {ticker} to Watchlist"):
-        st.session_state.watchlist.append(ticker)
-        st.rerun()
-
-# Display watchlist
-if st.session_state.watchlist:
-    for wl_ticker in st.session_state.watchlist:
-        col1, col2 = st.sidebar.columns([3, 1])
-        col1.markdown(f"**{wl_ticker}**")
-        if col2.button("X", key=f"remove_{wl_ticker}"):
-            st.session_state.watchlist.remove(wl_ticker)
-            st.rerun()
-else:
-    st.sidebar.caption("No tickers in watchlist")
+# Single-user by design: the file sits in the working directory and is shared
+# by every session, so on a multi-user deployment the last save wins
+WATCHLIST_FILE = "watchlist.json"
 
-# --- API CALL COUNTER ---
-st.sidebar.divider()
-st.sidebar.markdown("### API Usage")
+def load_watchlist():
+    """Load the saved watchlist from persistent storage."""
+    if os.path.exists(WATCHLIST_FILE):
+        try:
+            with open(WATCHLIST_FILE, 'r') as f:
+                return list(json.load(f).get('tickers', []))
+        except (json.JSONDecodeError, IOError) as e:
+            logger.error(f"Error loading watchlist: {e}")
+            return []
+    return []
 
-time_since_reset = datetime.now() - st.session_state.api_reset_time
-minutes_elapsed = int(time_since_reset.total_seconds() / 60)
+def save_watchlist(tickers):
+    """Save the watchlist to persistent storage."""
+    try:
+        with open(WATCHLIST_FILE + '.tmp', 'w') as f:
+            json.dump({'tickers': tickers}, f)
+        os.replace(WATCHLIST_FILE + '.tmp', WATCHLIST_FILE)
+    except IOError as e:
+        logger.error(f"Error saving watchlist: {e}")
 
-# Display counters as styled boxes for better visibility
-st.sidebar.markdown(f"""
-<div style='background-color: #1e3a5f; padding: 10px; border-radius: 5px; margin-bottom: 10px;'>
-    <p style='margin: 0; color: #94a3b8; font-size: 0.8em;'>Session Calls ({minutes_elapsed}m)</p>
-    <h3 style='margin: 5px 0; color: white;'>{st.session_state.api_calls}</h3>
-</div>
-<div style='background-color: #1e3a5f; padding: 10px; border-radius: 5px;'>
-    <p style='margin: 0; color: #94a3b8; font-size: 0.8em;'>Total (All Time)</p>
-    <h3 style='margin: 5px 0; color: white;'>{st.session_state.total_api_calls}</h3>
-</div>
-""", unsafe_allow_html=True)
+if 'watchlist' not in st.session_state:
+    st.session_state.watchlist = load_watchlist()
+
+# Sidebar widgets run as fragments: their buttons rerun only the fragment
+# instead of the whole script (analysis pipeline and active view included).
+# Buttons update state in on_click callbacks, which run before that rerun,
+# so the fragment redraws with the new state without calling st.rerun
+def add_to_watchlist(ticker):
+    st.session_state.watchlist.append(ticker)
+    save_watchlist(st.session_state.watchlist)
+
+def sync_watchlist(chips_key):
+    st.session_state.watchlist = list(st.session_state[chips_key])
+    save_watchlist(st.session_state.watchlist)
+
+@st.fragment
+def render_watchlist_sidebar(ticker):
+    st.divider()
+    st.markdown("### Watchlist")
+    
+    # Add to watchlist button
+    if ticker and ticker not in st.session_state.watchlist:
+        st.button(f"+ Add {ticker} to Watchlist", on_click=add_to_watchlist, args=(ticker,))
+    
+    # Display watchlist as one chip list instead of a row of widgets per
+    # ticker; removing a chip removes the ticker. The key follows the
+    # contents so the widget starts fresh whenever the list changes.
+    if st.session_state.watchlist:
+        chips_key = "watchlist_chips_" + "_".join(st.session_state.watchlist)
+        st.multiselect(
+            "Watchlist tickers",
+            options=st.session_state.watchlist,
+            default=st.session_state.watchlist,
+            key=chips_key,
+            on_change=sync_watchlist,
+            args=(chips_key,),
+            label_visibility="collapsed"
+        )
+    else:
+        st.caption("No tickers in watchlist")
 
-if st.sidebar.button("Reset Session"):
+# --- API CALL COUNTER ---
+def reset_api_session():
     st.session_state.api_calls = 0
     st.session_state.api_reset_time = datetime.now()
-    st.rerun()
 
-st.sidebar.caption("Rate limit: ~2,000/hour")
+@st.fragment
+def render_api_usage_sidebar():
+    st.divider()
+    st.markdown("### API Usage")
+    
+    time_since_reset = datetime.now() - st.session_state.api_reset_time
+    minutes_elapsed = int(time_since_reset.total_seconds() / 60)
+    
+    # Display counters as styled boxes for better visibility
+    st.markdown(f"""
+    <div style='background-color: #1e3a5f; padding: 10px; border-radius: 5px; margin-bottom: 10px;'>
+        <p style='margin: 0; color: #94a3b8; font-size: 0.8em;'>Session Calls ({minutes_elapsed}m)</p>
+        <h3 style='margin: 5px 0; color: white;'>{st.session_state.api_calls}</h3>
+    </div>
+    <div style='background-color: #1e3a5f; padding: 10px; border-radius: 5px;'>
+        <p style='margin: 0; color: #94a3b8; font-size: 0.8em;'>Total (All Time)</p>
+        <h3 style='margin: 5px 0; color: white;'>{st.session_state.total_api_calls}</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.button("Reset Session", on_click=reset_api_session)
+    
+    st.caption("Rate limit: ~2,000/hour")
+
+with st.sidebar:
+    render_watchlist_sidebar(ticker)
+    render_api_usage_sidebar()
 
 # --- SETTINGS ---
 st.sidebar.divider()
@@ -278,28 +301,58 @@ with st.sidebar.expander("⚙️ Settings"):
 # --- HEADER: TICKER TAPE REMOVED (Replaced by Grid in Tab 1) ---
 
 # --- TOP SIGNALS TODAY ---
+@st.cache_data(ttl=300, show_spinner=False)
+def get_top_signals():
+    """
+    Reduces the macro data to the scalars shown in the Top Signals row.
+    
+    Returns:
+        dict with 'spx_uptrend', 'spread' (bps) and 'gold_ret'; each is None when unavailable
+    """
+    macro_data = fetch_macro_data()
+    signals = {'spx_uptrend': None, 'spread': None, 'gold_ret': None}
+    
+    # 1. Market Trend (SP500 > 200 SMA)
+    if not macro_data.empty and '^GSPC' in macro_data['Close']:
+        # Closes share an index with 24/7 BTC, so drop the weekend/holiday NaNs
+        spx = macro_data['Close']['^GSPC'].dropna()
+        if len(spx) >= 200:
+            signals['spx_uptrend'] = bool(spx.iloc[-1] > spx.tail(200).mean())
+    
+    # 2. Yield Spread (10Y-3M)
+    yields = get_yield_curve_data(macro_data)
+    if yields is not None:
+        # Read the last valid value in place rather than copying the non-NaN rows
+        last = yields['Spread'].last_valid_index()
+        if last is not None:
+            signals['spread'] = float(yields['Spread'].at[last])
+    
+    # 3. Gold/Risk Proxy
+    if not macro_data.empty and 'GC=F' in macro_data['Close']:
+        gold = macro_data['Close']['GC=F'].dropna()
+        if len(gold) >= 20:
+            signals['gold_ret'] = float((gold.iloc[-1] / gold.iloc[-20]) - 1) # 1-month return
+    
+    return signals
+
 st.markdown("### ⚡ Top Signals Today")
 st.caption(f"Data freshness: ~{datetime.now().strftime('%Y-%m-%d %H:%M %Z')}")
 
 try:
-    macro_data = fetch_macro_data()
+    signals = get_top_signals()
     sig_col1, sig_col2, sig_col3, sig_col4 = st.columns(4)
     
     # 1. Market Trend (SP500 > 200 SMA)
-    if not macro_data.empty and '^GSPC' in macro_data['Close']:
-        spx = macro_data['Close']['^GSPC']
-        spx_close = spx.iloc[-1]
-        spx_sma200 = spx.rolling(200).mean().iloc[-1]
-        trend_color = "#4ade80" if spx_close > spx_sma200 else "#ef4444"
-        trend_text = "UPTREND" if spx_close > spx_sma200 else "DOWNTREND"
+    if signals['spx_uptrend'] is not None:
+        trend_color = "#4ade80" if signals['spx_uptrend'] else "#ef4444"
+        trend_text = "UPTREND" if signals['spx_uptrend'] else "DOWNTREND"
         sig_col1.markdown(f"**SPX Form:** <span style='color:{trend_color}; font-weight:bold;'>{trend_text}</span>", unsafe_allow_html=True)
     else:
         sig_col1.markdown("**SPX Form:** N/A")
         
     # 2. Yield Spread (10Y-3M)
-    yields = get_yield_curve_data(macro_data)
-    if yields is not None:
-        spread = yields['Spread'].dropna().iloc[-1]
+    spread = signals['spread']
+    if spread is not None:
         spread_color = "#ef4444" if spread < 0 else "#4ade80"
         spread_text = "INVERTED" if spread < 0 else "NORMAL"
         sig_col2.markdown(f"**Yield Curve:** <span style='color:{spread_color}; font-weight:bold;'>{spread_text}</span> ({spread:+.0f} bps)", unsafe_allow_html=True)
@@ -307,11 +360,9 @@ try:
         sig_col2.markdown("**Yield Curve:** N/A")
 
     # 3. Gold/Risk Proxy
-    if not macro_data.empty and 'GC=F' in macro_data['Close']:
-        gold = macro_data['Close']['GC=F']
-        gold_ret = (gold.iloc[-1] / gold.iloc[-20]) - 1 # 1-month return
+    if signals['gold_ret'] is not None:
         gold_color = "#fbbf24"
-        sig_col3.markdown(f"**Gold (1M):** <span style='color:{gold_color}; font-weight:bold;'>{gold_ret:+.1%}</span>", unsafe_allow_html=True)
+        sig_col3.markdown(f"**Gold (1M):** <span style='color:{gold_color}; font-weight:bold;'>{signals['gold_ret']:+.1%}</span>", unsafe_allow_html=True)
     else:
         sig_col3.markdown("**Gold (1M):** N/A")
         
@@ -349,91 +400,27 @@ active_view = st.pills(
 st.divider()
 
 # --- RENDER ACTIVE VIEW ---
-if active_view == "📊 Market Health":
-    try:
-        from views.market_health import render_market_health
-        render_market_health(render_mini_chart_html, track_api_call)
-    except Exception as e:
-        logger.error(f"Error rendering Market Health: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "📈 Sector Rotation":
-    try:
-        from views.sector_rotation import render_sector_rotation
-        render_sector_rotation(track_api_call)
-    except Exception as e:
-        logger.error(f"Error rendering Sector Rotation: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "🌐 Intermarket":
-    try:
-        from views.intermarket import render_intermarket
-        render_intermarket(track_api_call)
-    except Exception as e:
-        logger.error(f"Error rendering Intermarket: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "📉 Stock Analysis":
+# Tab label -> (display name, view module, render function, render arguments)
+VIEW_RENDERERS = {
+    "📊 Market Health": ("Market Health", "views.market_health", "render_market_health", lambda: (render_mini_chart_html, track_api_call)),
+    "📈 Sector Rotation": ("Sector Rotation", "views.sector_rotation", "render_sector_rotation", lambda: (track_api_call,)),
+    "🌐 Intermarket": ("Intermarket", "views.intermarket", "render_intermarket", lambda: (track_api_call,)),
+    "📉 Stock Analysis": ("Stock Analysis", "views.stock_analysis", "render_stock_analysis", lambda: (ticker, track_api_call, run_analysis_pipeline, calculate_mphinancial_mechanics, get_tv_symbol)),
+    "🏛️ Congress Trades": ("Congress Trades", "views.congress_trades", "render_congress_trades", lambda: (track_api_call,)),
+    "🌪️ Options Flow": ("Options Flow", "views.options_intelligence", "render_options_intelligence", lambda: (ticker, track_api_call)),
+    "🔍 Stock Screener": ("Screener", "views.screener_tab", "render_screener", lambda: ()),
+    "⚡ Power Gauge": ("Power Gauge", "views.power_gauge_tab", "render_power_gauge", lambda: (ticker,)),
+    "📉 Stage Analysis": ("Stage Analysis", "views.weinstein_tab", "render_weinstein", lambda: (ticker,)),
+    "🚀 CANSLIM": ("CANSLIM", "views.canslim_tab", "render_canslim", lambda: (ticker,)),
+    "💼 Navellier Grade": ("Navellier Grade", "views.navellier_tab", "render_navellier", lambda: (ticker,)),
+}
+
+if active_view in VIEW_RENDERERS:
+    view_name, module_name, render_name, render_args = VIEW_RENDERERS[active_view]
     try:
-        from views.stock_analysis import render_stock_analysis
-        render_stock_analysis(ticker, track_api_call, run_analysis_pipeline, calculate_mphinancial_mechanics, get_tv_symbol)
+        # Only the active view is imported; later reruns find it in sys.modules
+        render = getattr(importlib.import_module(module_name), render_name)
+        render(*render_args())
     except Exception as e:
-        logger.error(f"Error rendering Stock Analysis: {e}")
+        logger.error(f"Error rendering {view_name}: {e}")
         st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "🏛️ Congress Trades":
-    try:
-        from views.congress_trades import render_congress_trades
-        render_congress_trades(track_api_call)
-    except Exception as e:
-        logger.error(f"Error rendering Congress Trades: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "🌪️ Options Flow":
-    try:
-        from views.options_intelligence import render_options_intelligence
-        render_options_intelligence(ticker, track_api_call)
-    except Exception as e:
-        logger.error(f"Error rendering Options Flow: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "🔍 Stock Screener":
-    try:
-        from views.screener_tab import render_screener
-        render_screener()
-    except Exception as e:
-        logger.error(f"Error rendering Screener: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "⚡ Power Gauge":
-    try:
-        from views.power_gauge_tab import render_power_gauge
-        render_power_gauge(ticker)
-    except Exception as e:
-        logger.error(f"Error rendering Power Gauge: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "📉 Stage Analysis":
-    try:
-        from views.weinstein_tab import render_weinstein
-        render_weinstein(ticker)
-    except Exception as e:
-        logger.error(f"Error rendering Stage Analysis: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "🚀 CANSLIM":
-    try:
-        from views.canslim_tab import render_canslim
-        render_canslim(ticker)
-    except Exception as e:
-        logger.error(f"Error rendering CANSLIM: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
-elif active_view == "💼 Navellier Grade":
-    try:
-        from views.navellier_tab import render_navellier
-        render_navellier(ticker)
-    except Exception as e:
-        logger.error(f"Error rendering Navellier Grade: {e}")
-        st.error("⚠️ An error occurred. Please try again later.")
-
@@ -17,10 +17,10 @@ def test_screener_logic():
     
     # Test Strategy Application
     print("\nTesting 'Safe Long' Strategy...")
-    safe_longs = apply_strategy(df, "Safe Long")
+    safe_longs = apply_strategy(df, "Safe Long", columns=['Price', 'DivYield', 'Beta'])
     print(f"Safe Long Candidates: {len(safe_longs)}")
     if not safe_longs.empty:
-        print(safe_longs[['Price', 'DivYield', 'Beta']].head())
+        print(safe_longs.head())
 
 if __name__ == "__main__":
     test_screener_logic()
@@ -1,8 +1,12 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
+import numpy as np
 import sys
 import os
+import json
+import tempfile
+import time
 
 # Add parent dir to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -10,10 +14,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from gamma_profile import get_gamma_profile
 from congress_tracker import fetch_congress_members
 from seaf_model import get_seaf_model
-from options_flow import get_daily_flow_snapshot
+from options_flow import get_daily_flow_snapshot, summarize_flow_side
+from asbury_metrics import get_asbury_6_signals, get_asbury_6_historical
+from services.cache import disk_cache, sweep_cache
+from services.analysis_pipeline import run_analysis_pipeline, recent_failures, clear_analysis_failure
+from services.downsample import lttb_indices
 
 class TestCoreModules(unittest.TestCase):
     
+    def setUp(self):
+        # Keep the disk cache out of the working tree and isolated per test
+        self._cache_dir = tempfile.TemporaryDirectory()
+        cache_patch = patch('services.cache.CACHE_DIR', self._cache_dir.name)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        self.addCleanup(self._cache_dir.cleanup)
+    
     @patch('gamma_profile.get_cached_options_chain')
     def test_gamma_profile_structure(self, mock_get_chain):
         """Verify get_gamma_profile returns the exact keys expected by the UI."""
@@ -47,22 +63,22 @@ class TestCoreModules(unittest.TestCase):
         self.assertIsInstance(result['gex'], pd.Series)
         self.assertIsInstance(result['volume'], pd.DataFrame)
         
-    @patch('congress_tracker.requests.get')
-    def test_congress_api_error_handling(self, mock_get):
+    @patch('congress_tracker.get_congress_session')
+    def test_congress_api_error_handling(self, mock_session):
         """Verify fetch_congress_members handles API errors properly."""
         # Simulate 403 Forbidden
         mock_response = MagicMock()
         mock_response.status_code = 403
         mock_response.reason = "Forbidden"
-        mock_get.return_value = mock_response
+        mock_session.return_value.get.return_value = mock_response
         
         # Should return empty DataFrame (and log error to streamlit, which we ignore here)
         result = fetch_congress_members(api_key="BAD_KEY")
         self.assertIsInstance(result, pd.DataFrame)
         self.assertTrue(result.empty)
 
-    @patch('congress_tracker.requests.get')
-    def test_congress_api_success(self, mock_get):
+    @patch('congress_tracker.get_congress_session')
+    def test_congress_api_success(self, mock_session):
         """Verify fetch_congress_members parses valid response."""
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -76,7 +92,7 @@ class TestCoreModules(unittest.TestCase):
                 {"name": "Empty Rep", "terms": []}
             ]
         }
-        mock_get.return_value = mock_response
+        mock_session.return_value.get.return_value = mock_response
         
         result = fetch_congress_members(api_key="GOOD_KEY")
         self.assertFalse(result.empty)
@@ -96,7 +112,7 @@ class TestCoreModules(unittest.TestCase):
             'Close': [100 + i for i in range(300)],
             'Volume': [1000 for _ in range(300)]
         }, index=dates)
-        mock_fetch.return_value = mock_data
+        mock_fetch.side_effect = lambda tickers, start, end: {t: mock_data for t in tickers}
         
         result = get_seaf_model()
         
@@ -106,15 +122,16 @@ class TestCoreModules(unittest.TestCase):
         for col in expected_cols:
             self.assertIn(col, result.columns)
 
+    @patch('options_flow.fetch_stock_info')
     @patch('options_flow.yf.Ticker')
-    def test_options_flow_structure(self, mock_ticker_class):
+    def test_options_flow_structure(self, mock_ticker_class, mock_info):
         """Verify Options Flow returns correct keys (pc_premium_ratio, etc)."""
         mock_ticker = MagicMock()
         mock_ticker_class.return_value = mock_ticker
         
         # Mock options
         mock_ticker.options = ['2023-01-01']
-        mock_ticker.info = {'currentPrice': 100}
+        mock_info.return_value = {'currentPrice': 100}
         
         # Mock chain
         mock_chain = MagicMock()
@@ -136,5 +153,140 @@ class TestCoreModules(unittest.TestCase):
         self.assertIn('net_premium', result)
         self.assertIn('unusual_calls', result)
 
+    @patch('asbury_metrics.fetch_basket_data')
+    def test_asbury_historical_matches_signals(self, mock_fetch):
+        """Verify the vectorized history scores the latest day like the live signal."""
+        rng = np.random.default_rng(42)
+        dates = pd.bdate_range(end=pd.Timestamp.now(), periods=120)
+        
+        def make_frame(base):
+            close = base * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+            return pd.DataFrame({
+                'High': close * 1.01,
+                'Close': close,
+                'Volume': rng.integers(1_000_000, 5_000_000, len(dates)).astype(float)
+            }, index=dates)
+        
+        frames = (make_frame(500), make_frame(200), make_frame(90), make_frame(18))
+        mock_fetch.side_effect = lambda *args: tuple(df.copy() for df in frames)
+        
+        signals = get_asbury_6_signals()
+        history = get_asbury_6_historical(days=90)
+        
+        self.assertNotIn('error', signals)
+        self.assertEqual(len(history), len(dates) - 60)
+        for col in ['Date', 'Positive_Count', 'Negative_Count', 'Signal', 'SPY_Close']:
+            self.assertIn(col, history.columns)
+        
+        latest = history.iloc[-1]
+        self.assertEqual(latest['Positive_Count'], signals['positive_count'])
+        self.assertEqual(latest['Negative_Count'], signals['negative_count'])
+        self.assertEqual(latest['Signal'], signals['signal'])
+
+    @patch('asbury_metrics.fetch_basket_data')
+    def test_asbury_signals_rejects_short_history(self, mock_fetch):
+        """Verify too few bars returns the error state instead of partial metrics."""
+        dates = pd.bdate_range(end=pd.Timestamp.now(), periods=10)
+        frame = pd.DataFrame({'High': 1.0, 'Close': 1.0, 'Volume': 1.0}, index=dates)
+        mock_fetch.return_value = (frame, frame, frame, frame)
+        
+        signals = get_asbury_6_signals()
+        
+        self.assertEqual(signals['signal'], 'ERROR')
+        self.assertIn('error', signals)
+        self.assertEqual(signals['metrics'], [])
+
+    def test_disk_cache_reuses_fresh_results(self):
+        """Verify disk_cache serves a repeat call from disk and skips empty results."""
+        calls = []
+        
+        @disk_cache(ttl=60)
+        def fetch(symbol):
+            calls.append(symbol)
+            return pd.DataFrame({'Close': [1.0, 2.0]}) if symbol != 'EMPTY' else pd.DataFrame()
+        
+        first = fetch('SPY')
+        second = fetch('SPY')
+        fetch('EMPTY')
+        fetch('EMPTY')
+        
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(calls, ['SPY', 'EMPTY', 'EMPTY'])
+
+    def test_disk_cache_evicts_stale_entries(self):
+        """Verify expired entries are deleted on read and old files are swept."""
+        results = [pd.DataFrame(), pd.DataFrame({'Close': [1.0]})]
+        
+        @disk_cache(ttl=60)
+        def fetch(symbol):
+            return results.pop()
+        
+        fetch('SPY')
+        folder = os.path.join(self._cache_dir.name, 'SPY')
+        meta_path = next(os.path.join(folder, n) for n in os.listdir(folder) if n.endswith('.meta.json'))
+        with open(meta_path, 'w') as f:
+            json.dump({'timestamp': 0}, f)
+        
+        # The refetch comes back empty, so nothing replaces the expired files
+        fetch('SPY')
+        self.assertEqual(os.listdir(folder), [])
+        
+        stale = os.path.join(folder, 'fetch_old.pkl')
+        with open(stale, 'wb') as f:
+            f.write(b'x')
+        old = time.time() - 10 * 24 * 3600
+        os.utime(stale, (old, old))
+        
+        self.assertEqual(sweep_cache(), 1)
+        self.assertFalse(os.path.exists(folder))
+
+    def test_lttb_keeps_shape(self):
+        """Verify LTTB keeps the endpoints and extremes of a long series."""
+        y = np.sin(np.linspace(0, 20, 5000)) + np.linspace(0, 1, 5000)
+        idx = lttb_indices(y, 400)
+        
+        self.assertEqual(len(idx), 400)
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        self.assertAlmostEqual(y[idx].max(), y.max(), places=3)
+        self.assertAlmostEqual(y[idx].min(), y.min(), places=3)
+        np.testing.assert_array_equal(lttb_indices(y[:10], 400), np.arange(10))
+
+    def test_flow_top_contracts_match_nlargest_on_ties(self):
+        """Verify tied premiums keep nlargest's first-occurrence order."""
+        df = pd.DataFrame({
+            'strike': np.arange(100, 110, dtype=float),
+            'expiration': ['2026-01-16'] * 10,
+            'volume': [10] * 10,
+            'openInterest': [10] * 10,
+            'premium': [500.0, 0.0, 500.0, 900.0, 0.0, 500.0, 500.0, 0.0, 900.0, 500.0]
+        })
+        
+        top = summarize_flow_side(df)[3]
+        
+        self.assertEqual(top.index.tolist(), df.nlargest(5, 'premium').index.tolist())
+
+    @patch('services.analysis_pipeline.st.status')
+    @patch('services.analysis_pipeline.get_canslim_metrics')
+    @patch('services.analysis_pipeline.get_weinstein_stage')
+    @patch('services.analysis_pipeline.calculate_power_gauge')
+    def test_recent_failure_suppresses_analysis_fetch(self, mock_gauge, mock_weinstein, mock_canslim, mock_status):
+        """Verify a failure recorded for a ticker stops any session from refetching it."""
+        import streamlit as st
+        self.addCleanup(recent_failures().clear)
+        st.session_state.analysis_data = {'ticker': 'OTHER', 'power_gauge': {'score': 50}}
+        recent_failures()['FAIL'] = time.monotonic() + 60
+        
+        run_analysis_pipeline('FAIL')
+        
+        mock_gauge.assert_not_called()
+        mock_weinstein.assert_not_called()
+        mock_canslim.assert_not_called()
+        self.assertEqual(st.session_state.analysis_data['ticker'], 'FAIL')
+        self.assertIsNone(st.session_state.analysis_data['power_gauge'])
+        
+        clear_analysis_failure('FAIL')
+        self.assertNotIn('FAIL', recent_failures())
+
 if __name__ == '__main__':
     unittest.main()
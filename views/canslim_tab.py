@@ -1,5 +1,15 @@
 import streamlit as st
 from canslim import get_canslim_metrics
+from services.analysis_pipeline import clear_analysis_failure
+
+def checklist_table(items):
+    """Renders (factor, {'pass', 'value'}) pairs as one markdown table."""
+    rows = ["| | Factor | Value |", "|---|---|---|"]
+    for k, v in items:
+        # Escape characters markdown would read as a cell break or LaTeX
+        value = str(v['value']).replace('|', r'\|').replace('$', r'\$')
+        rows.append(f"| {'✅' if v['pass'] else '❌'} | {k} | {value} |")
+    return "\n".join(rows)
 
 def render_canslim(ticker):
     st.header(f"🚀 CANSLIM Growth Strategy: {ticker}")
@@ -47,16 +57,12 @@ def render_canslim(ticker):
         items = list(checklist.items())
         mid = len(items) // 2
         
-        for k, v in items[:mid]:
-            with col_c1:
-                st.checkbox(f"{k}: {v['value']}", value=v['pass'], key=k, disabled=True)
-                
-        for k, v in items[mid:]:
-            with col_c2:
-                st.checkbox(f"{k}: {v['value']}", value=v['pass'], key=k+"2", disabled=True)
+        col_c1.markdown(checklist_table(items[:mid]))
+        col_c2.markdown(checklist_table(items[mid:]))
 
     elif not c_data and ticker:
         st.warning(f"⚠️ CANSLIM data unavailable for {ticker}.")
         if st.button("Retry CANSLIM Check", key="retry_canslim"):
+             clear_analysis_failure(ticker)
              st.session_state.analysis_data = {'ticker': None} # Force reset
              st.rerun()
@@ -1,8 +1,40 @@
 import streamlit as st
 import pandas as pd
-import re
+import string
 from congress_tracker import fetch_congress_members, fetch_stock_disclosures, get_top_traded_tickers, get_active_traders, check_watchlist_overlap
 
+class _KeepOnly(dict):
+    """str.translate table that deletes every character it was not built with."""
+    def __missing__(self, key):
+        return None
+
+# Ticker characters plus the comma separator; everything else is dropped
+_WATCHLIST_CHARS = _KeepOnly({ord(c): c for c in string.ascii_uppercase + string.digits + '-,'})
+
+# Trades table columns -> display headers
+DISPLAY_COLUMNS = {
+    'date': 'Date',
+    'member': 'Member',
+    'party': 'Party',
+    'ticker': 'Ticker',
+    'transaction': 'Type',
+    'amount': 'Amount',
+}
+
+# Cell background per value in the trades table; other values stay unstyled
+TRANSACTION_STYLES = {
+    'Purchase': 'background-color: #1a4d2e; color: white',
+    'Sale': 'background-color: #4d1a1a; color: white',
+}
+PARTY_STYLES = {
+    'D': 'background-color: #1e3a5f; color: white',
+    'R': 'background-color: #5f1e1e; color: white',
+}
+
+def _cell_styles(col, styles):
+    """Maps a whole column to CSS at once for Styler.apply."""
+    return col.map(styles).fillna('')
+
 def render_congress_trades(track_api_call):
     st.title("🏛️ Congressional Trading Tracker")
     
@@ -40,10 +72,11 @@ def render_congress_trades(track_api_call):
         
         sum_col1, sum_col2, sum_col3, sum_col4 = st.columns(4)
         
-        purchases = len(trades_df[trades_df['transaction'] == 'Purchase'])
-        sales = len(trades_df[trades_df['transaction'] == 'Sale'])
-        unique_tickers = trades_df['ticker'].nunique()
-        unique_traders = trades_df['member'].nunique()
+        # One pass per column: tally transaction types, count distinct tickers/members
+        counts = trades_df['transaction'].value_counts()
+        purchases = int(counts.get('Purchase', 0))
+        sales = int(counts.get('Sale', 0))
+        unique_tickers, unique_traders = trades_df.agg({'ticker': 'nunique', 'member': 'nunique'})
         
         sum_col1.markdown(f"""
         <div style='background-color: #1a4d2e; padding: 15px; border-radius: 8px; text-align: center;'>
@@ -82,27 +115,13 @@ def render_congress_trades(track_api_call):
             st.subheader("Recent Trades")
             
             # Style the trades table
-            display_trades = trades_df[['date', 'member', 'party', 'ticker', 'transaction', 'amount']].copy()
-            display_trades.columns = ['Date', 'Member', 'Party', 'Ticker', 'Type', 'Amount']
-            
-            def color_transaction(val):
-                if val == 'Purchase':
-                    return 'background-color: #1a4d2e; color: white'
-                elif val == 'Sale':
-                    return 'background-color: #4d1a1a; color: white'
-                return ''
-            
-            def color_party(val):
-                if val == 'D':
-                    return 'background-color: #1e3a5f; color: white'
-                elif val == 'R':
-                    return 'background-color: #5f1e1e; color: white'
-                return ''
+            # Nothing mutates this frame, so select and rename in one step without .copy()
+            display_trades = trades_df[list(DISPLAY_COLUMNS)].rename(columns=DISPLAY_COLUMNS, copy=False)
             
-            styled_trades = display_trades.style.applymap(
-                color_transaction, subset=['Type']
-            ).applymap(
-                color_party, subset=['Party']
+            styled_trades = display_trades.style.apply(
+                _cell_styles, subset=['Type'], styles=TRANSACTION_STYLES
+            ).apply(
+                _cell_styles, subset=['Party'], styles=PARTY_STYLES
             )
             
             st.dataframe(styled_trades, width="stretch", hide_index=True)
@@ -152,8 +171,8 @@ def render_congress_trades(track_api_call):
             placeholder="e.g., NVDA, AAPL, TSLA, META"
         )
         if watchlist_input:
-            # Sanitize each ticker individually while keeping commas
-            watchlist_input = ','.join([re.sub(r'[^A-Z0-9-]', '', t.upper().strip()) for t in watchlist_input.split(',')])
+            # Sanitize all tickers in one pass while keeping commas
+            watchlist_input = watchlist_input.upper().translate(_WATCHLIST_CHARS)
         
         if watchlist_input:
             watchlist = [t.strip().upper() for t in watchlist_input.split(',')]
@@ -7,6 +7,22 @@ from macro_analysis import (
     render_intermarket_chart
 )
 
+@st.cache_data(ttl=900, show_spinner=False)
+def load_intermarket_data():
+    """
+    Fetches the macro panel and derives the yield curve and performance frames.
+
+    Cached so reruns from unrelated widgets reuse the derived frames instead
+    of recomputing them from the panel.
+
+    Returns:
+        Tuple of (macro_data, yield_data or None, perf_df or None)
+    """
+    macro_data = fetch_macro_data()
+    if macro_data.empty:
+        return macro_data, None, None
+    return macro_data, get_yield_curve_data(macro_data), get_asset_performance(macro_data)
+
 def render_intermarket(track_api_call):
     st.title("🌐 Macro & Intermarket Intelligence")
     st.markdown("""
@@ -15,7 +31,7 @@ def render_intermarket(track_api_call):
     
     with st.spinner("🌍 Loading macro indicators..."):
         track_api_call()
-        macro_data = fetch_macro_data()
+        macro_data, yield_data, perf_df = load_intermarket_data()
         
     if not macro_data.empty:
         # --- Top Level Metrics ---
@@ -24,17 +40,14 @@ def render_intermarket(track_api_call):
             # Safely access data handling both MultiIndex and standard structures
             closes = macro_data['Close'] if 'Close' in macro_data else macro_data
             
-            # Helper to get last valid value
-            def get_last(ticker):
-                if ticker in closes:
-                    return closes[ticker].dropna().iloc[-1]
-                return 0
+            # Last valid value per ticker in one pass; missing tickers read as 0
+            latest = closes.ffill().iloc[-1]
             
-            us10y = get_last('^TNX')
-            oil = get_last('CL=F')
-            gold = get_last('GC=F')
-            dxy = get_last('DX-Y.NYB')
-            btc = get_last('BTC-USD')
+            us10y = float(latest.get('^TNX', 0))
+            oil = float(latest.get('CL=F', 0))
+            gold = float(latest.get('GC=F', 0))
+            dxy = float(latest.get('DX-Y.NYB', 0))
+            btc = float(latest.get('BTC-USD', 0))
             
             m_col1, m_col2, m_col3, m_col4, m_col5 = st.columns(5)
             
@@ -51,7 +64,6 @@ def render_intermarket(track_api_call):
         
         # --- Yield Curve Section ---
         st.subheader("Yield Curve Dynamics")
-        yield_data = get_yield_curve_data(macro_data)
         
         if yield_data is not None:
             fig_yield = render_yield_curve_chart(yield_data)
@@ -67,7 +79,6 @@ def render_intermarket(track_api_call):
         
         # --- Intermarket Performance ---
         st.subheader("Asset Class Performance (1 Year)")
-        perf_df = get_asset_performance(macro_data)
         
         if perf_df is not None:
             fig_perf = render_intermarket_chart(perf_df)
@@ -1,4 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import streamlit as st
+import yfinance as yf
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit.components.v1 as components
@@ -7,19 +11,184 @@ from asbury_metrics import get_asbury_6_signals, get_asbury_6_historical
 from services.logger import setup_logger
 logger = setup_logger(__name__)
 
+# Market Snapshot grid: (column, TradingView symbol, label), filled top to bottom
+SNAPSHOT_CHARTS = (
+    (0, "FOREXCOM:SPXUSD", "S&P 500"),
+    (0, "FX:EURUSD", "EUR/USD"),
+    (1, "FOREXCOM:NSXUSD", "Nasdaq 100"),
+    (1, "BITSTAMP:BTCUSD", "Bitcoin"),
+    (2, "FOREXCOM:DJI", "Dow 30"),
+    (2, "CMCMARKETS:GOLD", "Gold"),
+)
+
+# Background shade per A6 signal; anything else is neutral
+SIGNAL_SHADES = {'BUY': 'rgba(0,255,0,0.1)', 'CASH': 'rgba(255,0,0,0.1)'}
+NEUTRAL_SHADE = 'rgba(255,255,0,0.05)'
+
+def signal_shading(historical_data):
+    """
+    Builds the background rectangles for the top subplot of the history chart.
+
+    Each day is shaded up to the next day in the colour of its signal, so
+    consecutive days with the same signal are merged into one rectangle.
+
+    Returns:
+        List of plotly shape dicts
+    """
+    if len(historical_data) < 2:
+        return []
+    
+    dates = historical_data['Date']
+    # The last day has no following day to shade up to
+    signals = historical_data['Signal'].to_numpy()[:-1]
+    starts = np.flatnonzero(np.r_[True, signals[1:] != signals[:-1]])
+    ends = np.r_[starts[1:], len(signals)]
+    
+    return [
+        dict(
+            type='rect', xref='x', yref='y domain',
+            x0=dates.iloc[start], x1=dates.iloc[end], y0=0, y1=1,
+            fillcolor=SIGNAL_SHADES.get(signals[start], NEUTRAL_SHADE),
+            layer='below', line=dict(width=0)
+        )
+        for start, end in zip(starts, ends)
+    ]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_vix_term_structure():
+    """
+    Fetches the latest VIX spot and VIX3M closes in one download.
+
+    Returns:
+        Tuple of (vix_spot, vix3m) floats
+    """
+    closes = yf.download(['^VIX', '^VIX3M'], period='1d', progress=False)['Close'].ffill().iloc[-1]
+    vix_spot, vix3m = float(closes['^VIX']), float(closes['^VIX3M'])
+    if np.isnan(vix_spot) or np.isnan(vix3m):
+        # Raising keeps the failure out of the cache
+        raise ValueError("VIX term structure incomplete")
+    return vix_spot, vix3m
+
+@st.fragment(run_every=300)
+def vix_term_structure_panel():
+    """VIX spot vs 3M card; refreshes on its own every five minutes without rerunning the page."""
+    try:
+        vix_spot, vix3m = fetch_vix_term_structure()
+        spread = vix3m - vix_spot
+
+        structure_color = "#1a4d2e" if spread > 0 else "#4d1a1a"
+        structure_text = "Contango (Bullish)" if spread > 0 else "Backwardation (Bearish)"
+
+        st.markdown(f"""
+        <div style='background-color: {structure_color}; padding: 15px; border-radius: 8px; text-align: center; border: 1px solid #4b5563;'>
+            <h5 style='color: #e5e7eb; margin: 0;'>VIX Term Structure</h5>
+            <div style='display: flex; justify-content: space-around; margin-top: 5px;'>
+                <div><span style='color:#9ca3af; font-size:0.8em'>Spot</span><br><b>{vix_spot:.2f}</b></div>
+                <div><span style='color:#9ca3af; font-size:0.8em'>3M Future</span><br><b>{vix3m:.2f}</b></div>
+                <div><span style='color:#9ca3af; font-size:0.8em'>Spread</span><br><b>{spread:+.2f}</b></div>
+            </div>
+            <p style='margin: 5px 0 0 0; font-weight: bold; color: white;'>{structure_text}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    except Exception as e:
+        logger.info(f"Error rendering VIX term structure: {e}")
+        st.caption("VIX data unavailable")
+
+def render_signal_history(historical_data):
+    """A6 positive count plotted under SPX normalized to 100, shaded by signal."""
+    st.subheader("📈 A6 Signal History vs SPX Performance")
+
+    # Normalize SPY price for comparison (set first value to 100)
+    historical_data['SPY_Normalized'] = (historical_data['SPY_Close'] / historical_data['SPY_Close'].iloc[0]) * 100
+
+    # Create subplot with two y-axes
+    fig_history = make_subplots(
+        rows=2, cols=1,
+        row_heights=[0.7, 0.3],
+        subplot_titles=("SPX Price (Normalized to 100)", "A6 Signal Count"),
+        vertical_spacing=0.1
+    )
+
+    # SPY price line (WebGL)
+    fig_history.add_trace(
+        go.Scattergl(
+            x=historical_data['Date'],
+            y=historical_data['SPY_Normalized'],
+            name='SPX',
+            line=dict(color='cyan', width=2),
+            hovertemplate='Date: %{x}<br>SPX: %{y:.1f}<extra></extra>'
+        ),
+        row=1, col=1
+    )
+
+    # Add background shading for BUY/CASH signals
+    fig_history.update_layout(shapes=signal_shading(historical_data))
+
+    # A6 positive count area chart (WebGL)
+    fig_history.add_trace(
+        go.Scattergl(
+            x=historical_data['Date'],
+            y=historical_data['Positive_Count'],
+            name='Positive Signals',
+            fill='tozeroy',
+            line=dict(color='lime', width=1),
+            hovertemplate='Date: %{x}<br>Positive: %{y}<extra></extra>'
+        ),
+        row=2, col=1
+    )
+
+    # Add reference line at 4 (signal threshold)
+    fig_history.add_hline(y=4, line_dash="dash", line_color="white", opacity=0.5, row=2, col=1)
+
+    fig_history.update_xaxes(title_text="Date", row=2, col=1)
+    fig_history.update_yaxes(title_text="Normalized Price", row=1, col=1)
+    fig_history.update_yaxes(title_text="Count", range=[0, 6], row=2, col=1)
+
+    fig_history.update_layout(
+        template="plotly_dark",
+        height=300,  # Reduced height
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+
+    st.plotly_chart(fig_history, width="stretch")
+
+def card_html(metric):
+    """One metric card as an HTML snippet; border and background follow its status."""
+    positive = metric['status'] == 'Positive'
+    status_color = "🟢" if positive else "🔴"
+    status_bg = "#1a4d2e" if positive else "#4d1a1a"
+    border = "#4ade80" if positive else "#ef4444"
+    return (
+        f"<div style='background-color: {status_bg}; padding: 10px; border-radius: 6px; border-left: 3px solid {border}'>"
+        f"<div style='display: flex; justify-content: space-between; align-items: center;'>"
+        f"<h5 style='margin: 0; color: white; font-size: 0.95em;'>{status_color} {metric['name']}</h5>"
+        f"<span style='font-size: 0.8em; color: #e5e7eb; font-weight: bold;'>{metric['status']}</span>"
+        f"</div>"
+        f"<p style='margin: 2px 0; color: #d1d5db; font-size: 0.8em;'>{metric['value']}</p>"
+        f"</div>"
+    )
+
+def render_metric_cards(metrics):
+    """The six Asbury metrics as coloured cards in a 3-column grid."""
+    st.subheader("Six Market Health Metrics")
+    
+    # One CSS grid in a single markdown element instead of one element per card
+    st.markdown(
+        "<div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 8px;'>"
+        + "".join(card_html(metric) for metric in metrics)
+        + "</div>",
+        unsafe_allow_html=True
+    )
+
 def render_market_health(render_mini_chart_html, track_api_call):
     st.subheader("Market Snapshot")
     # Grid Layout for Indices
-    mc1, mc2, mc3 = st.columns(3)
-    with mc1:
-        components.html(render_mini_chart_html("FOREXCOM:SPXUSD", "S&P 500"), height=220)
-        components.html(render_mini_chart_html("FX:EURUSD", "EUR/USD"), height=220)
-    with mc2:
-        components.html(render_mini_chart_html("FOREXCOM:NSXUSD", "Nasdaq 100"), height=220)
-        components.html(render_mini_chart_html("BITSTAMP:BTCUSD", "Bitcoin"), height=220)
-    with mc3:
-        components.html(render_mini_chart_html("FOREXCOM:DJI", "Dow 30"), height=220)
-        components.html(render_mini_chart_html("CMCMARKETS:GOLD", "Gold"), height=220)
+    snapshot_cols = st.columns(3)
+    for col_idx, symbol, label in SNAPSHOT_CHARTS:
+        with snapshot_cols[col_idx]:
+            components.html(render_mini_chart_html(symbol, label), height=220)
     
     st.divider()
     st.title("📊 Market Health Gauge (A6)")
@@ -29,10 +198,17 @@ def render_market_health(render_mini_chart_html, track_api_call):
     """)
     
     with st.spinner("⏳ Loading market health data..."):
-        track_api_call()  # Track API calls for Asbury 6
-        asbury_data = get_asbury_6_signals()
-        track_api_call()  # Track historical data
-        historical_data = get_asbury_6_historical(days=90)
+        # The signals, their history and the VIX pair are independent
+        # downloads, so fetch them together; the VIX fetch only warms the
+        # cache that vix_term_structure_panel reads from
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            track_api_call()  # Track API calls for Asbury 6
+            signals_future = executor.submit(get_asbury_6_signals)
+            track_api_call()  # Track historical data
+            history_future = executor.submit(get_asbury_6_historical, days=90)
+            executor.submit(fetch_vix_term_structure)
+            asbury_data = signals_future.result()
+            historical_data = history_future.result()
     
     if 'error' in asbury_data and asbury_data['signal'] == 'ERROR':
         st.error(f"⚠️ Error fetching Asbury 6 data: {asbury_data['error']}")
@@ -94,143 +270,17 @@ def render_market_health(render_mini_chart_html, track_api_call):
                 st.caption(f"Updated: {asbury_data['timestamp']}")
 
         with top_col2:
-            # Inline VIX Term Structure
-            try:
-                import yfinance as yf
-                vix_spot = yf.download('^VIX', period='1d', progress=False)['Close'].iloc[-1]
-                if hasattr(vix_spot, "item"): vix_spot = vix_spot.item()
-                
-                vix3m = yf.download('^VIX3M', period='1d', progress=False)['Close'].iloc[-1]
-                if hasattr(vix3m, "item"): vix3m = vix3m.item()
-                
-                spread = float(vix3m) - float(vix_spot)
-                
-                structure_color = "#1a4d2e" if spread > 0 else "#4d1a1a"
-                structure_text = "Contango (Bullish)" if spread > 0 else "Backwardation (Bearish)"
-                
-                st.markdown(f"""
-                <div style='background-color: {structure_color}; padding: 15px; border-radius: 8px; text-align: center; border: 1px solid #4b5563;'>
-                    <h5 style='color: #e5e7eb; margin: 0;'>VIX Term Structure</h5>
-                    <div style='display: flex; justify-content: space-around; margin-top: 5px;'>
-                        <div><span style='color:#9ca3af; font-size:0.8em'>Spot</span><br><b>{float(vix_spot):.2f}</b></div>
-                        <div><span style='color:#9ca3af; font-size:0.8em'>3M Future</span><br><b>{float(vix3m):.2f}</b></div>
-                        <div><span style='color:#9ca3af; font-size:0.8em'>Spread</span><br><b>{spread:+.2f}</b></div>
-                    </div>
-                    <p style='margin: 5px 0 0 0; font-weight: bold; color: white;'>{structure_text}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            except Exception as e:
-                logger.info(f"Error rendering VIX term structure: {e}")
-                st.caption("VIX data unavailable")
+            vix_term_structure_panel()
         
         st.divider()
         
         # Historical Chart with SPX
         if not historical_data.empty:
-            st.subheader("📈 A6 Signal History vs SPX Performance")
-            
-            # Normalize SPY price for comparison (set first value to 100)
-            historical_data['SPY_Normalized'] = (historical_data['SPY_Close'] / historical_data['SPY_Close'].iloc[0]) * 100
-            
-            # Create subplot with two y-axes
-            fig_history = make_subplots(
-                rows=2, cols=1,
-                row_heights=[0.7, 0.3],
-                subplot_titles=("SPX Price (Normalized to 100)", "A6 Signal Count"),
-                vertical_spacing=0.1
-            )
-            
-            # SPY price line
-            fig_history.add_trace(
-                go.Scatter(
-                    x=historical_data['Date'],
-                    y=historical_data['SPY_Normalized'],
-                    name='SPX',
-                    line=dict(color='cyan', width=2),
-                    hovertemplate='Date: %{x}<br>SPX: %{y:.1f}<extra></extra>'
-                ),
-                row=1, col=1
-            )
-            
-            # Add background shading for BUY/CASH signals
-            for i in range(len(historical_data)-1):
-                row = historical_data.iloc[i]
-                next_row = historical_data.iloc[i+1]
-                
-                if row['Signal'] == 'BUY':
-                    color = 'rgba(0,255,0,0.1)'
-                elif row['Signal'] == 'CASH':
-                    color = 'rgba(255,0,0,0.1)'
-                else:
-                    color = 'rgba(255,255,0,0.05)'
-                
-                fig_history.add_vrect(
-                    x0=row['Date'], x1=next_row['Date'],
-                    fillcolor=color, layer="below", line_width=0,
-                    row=1, col=1
-                )
-            
-            # A6 positive count area chart
-            fig_history.add_trace(
-                go.Scatter(
-                    x=historical_data['Date'],
-                    y=historical_data['Positive_Count'],
-                    name='Positive Signals',
-                    fill='tozeroy',
-                    line=dict(color='lime', width=1),
-                    hovertemplate='Date: %{x}<br>Positive: %{y}<extra></extra>'
-                ),
-                row=2, col=1
-            )
-            
-            # Add reference line at 4 (signal threshold)
-            fig_history.add_hline(y=4, line_dash="dash", line_color="white", opacity=0.5, row=2, col=1)
-            
-            fig_history.update_xaxes(title_text="Date", row=2, col=1)
-            fig_history.update_yaxes(title_text="Normalized Price", row=1, col=1)
-            fig_history.update_yaxes(title_text="Count", range=[0, 6], row=2, col=1)
-            
-            fig_history.update_layout(
-                template="plotly_dark",
-                height=300,  # Reduced height
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                margin=dict(l=0, r=0, t=30, b=0)
-            )
-            
-            st.plotly_chart(fig_history, width="stretch")
+            render_signal_history(historical_data)
         
         st.divider()
         
-        # Metric Cards in 3x2 Grid with better styling
-        st.subheader("Six Market Health Metrics")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        for idx, metric in enumerate(asbury_data['metrics']):
-            # Distribute metrics across columns
-            if idx % 3 == 0:
-                col = col1
-            elif idx % 3 == 1:
-                col = col2
-            else:
-                col = col3
-            
-            with col:
-                status_color = "🟢" if metric['status'] == 'Positive' else "🔴"
-                status_bg = "#1a4d2e" if metric['status'] == 'Positive' else "#4d1a1a"
-                
-                # Styled container with better contrast
-                # Compact Styled Container
-                st.markdown(f"""
-                <div style='background-color: {status_bg}; padding: 10px; border-radius: 6px; margin-bottom: 8px; border-left: 3px solid {"#4ade80" if metric["status"] == "Positive" else "#ef4444"}'>
-                    <div style='display: flex; justify-content: space-between; align-items: center;'>
-                        <h5 style='margin: 0; color: white; font-size: 0.95em;'>{status_color} {metric['name']}</h5>
-                        <span style='font-size: 0.8em; color: #e5e7eb; font-weight: bold;'>{metric['status']}</span>
-                    </div>
-                    <p style='margin: 2px 0; color: #d1d5db; font-size: 0.8em;'>{metric['value']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+        render_metric_cards(asbury_data['metrics'])
     
     st.divider()
 
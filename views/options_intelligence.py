@@ -1,9 +1,21 @@
+import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
 from gamma_profile import get_gamma_profile
 from options_flow import get_volatility_analysis, get_daily_flow_snapshot, analyze_flow_sentiment
 from services.data_fetcher import fetch_stock_history
 
+# Reruns from tab/expander clicks within the same minute reuse these results
+_gamma = st.cache_data(ttl=60, show_spinner=False)(get_gamma_profile)
+_flow = st.cache_data(ttl=60, show_spinner=False)(get_daily_flow_snapshot)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _vol(ticker):
+    """Volatility analysis keyed on the ticker alone, so the price history is never hashed."""
+    return get_volatility_analysis(ticker, fetch_stock_history(ticker))
+
+
 def render_options_intelligence(ticker, track_api_call):
     st.title("🌪️ Options Flow & Gamma Profile")
     
@@ -13,7 +25,7 @@ def render_options_intelligence(ticker, track_api_call):
         
         with st.spinner(f"Fetching options data for {ticker}..."):
             track_api_call()  # Track options chain fetch
-            gamma_data = get_gamma_profile(ticker)
+            gamma_data = _gamma(ticker)
         
         if 'error' in gamma_data:
             st.warning(f"⚠️ {gamma_data['error']}")
@@ -111,7 +123,7 @@ def render_options_intelligence(ticker, track_api_call):
                     x=gex.index,
                     y=gex.values / 1e6,
                     name='Total Gamma',
-                    marker_color=['#4ade80' if val > 0 else '#ef4444' for val in gex.values]
+                    marker_color=np.where(gex.values > 0, '#4ade80', '#ef4444').tolist()
                 ))
                 fig_gamma.update_layout(template="plotly_dark", height=400)
                 # Update axis titles
@@ -155,9 +167,7 @@ def render_options_intelligence(ticker, track_api_call):
         st.subheader(f"🌊 Options Flow Analysis: {ticker}")
         
         # --- VOLATILITY ANALYSIS ---
-        data = fetch_stock_history(ticker)
-            
-        vol_metrics = get_volatility_analysis(ticker, data)
+        vol_metrics = _vol(ticker)
         
         if vol_metrics and 'hv_20' in vol_metrics:
             st.markdown("### 🛡️ Options Strategy Intelligence")
@@ -191,7 +201,7 @@ def render_options_intelligence(ticker, track_api_call):
         st.divider()
         
         with st.spinner("Fetching daily flow data..."):
-            flow_data = get_daily_flow_snapshot(ticker)
+            flow_data = _flow(ticker)
         
         if not flow_data:
             st.warning("No flow data available.")
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from power_gauge import calculate_power_gauge
+from services.analysis_pipeline import clear_analysis_failure
 
 def render_power_gauge(ticker):
     st.header(f"⚡ Power Gauge Rating: {ticker}")
@@ -33,6 +34,7 @@ def render_power_gauge(ticker):
         with st.expander("Show Error Detail"):
             st.code(gauge['traceback'], language="python")
         if st.button("Retry Power Gauge", key="retry_power_gauge"):
+             clear_analysis_failure(ticker)
              st.session_state.analysis_data = {'ticker': None} # Force reset
              st.rerun()
              
@@ -213,5 +215,6 @@ def render_power_gauge(ticker):
     elif not gauge and ticker:
         st.warning(f"⚠️ Power Gauge data unavailable for {ticker}. Check connection or API limits.")
         if st.button("Retry Power Gauge", key="retry_power_gauge"):
+             clear_analysis_failure(ticker)
              st.session_state.analysis_data = {'ticker': None} # Force reset
              st.rerun()
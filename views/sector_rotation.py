@@ -51,10 +51,13 @@ def render_sector_rotation(track_api_call):
         end_str = datetime.now().strftime('%Y-%m-%d')
         start_str = (datetime.now() - pd.Timedelta(days=90)).strftime('%Y-%m-%d')
         
+        # One download for every sector; the correlation matrix below reuses it
+        recent_data = fetch_sector_data(tuple(SECTOR_ETFS), start_str, end_str)
+        
         for col, (_, row) in zip([chart_col1, chart_col2, chart_col3], top_3.iterrows()):
             with col:
                 sector_ticker = row['Ticker']
-                sector_data = fetch_sector_data(sector_ticker, start_str, end_str)
+                sector_data = recent_data.get(sector_ticker, pd.DataFrame())
                 
                 if not sector_data.empty:
                     # Calculate return
@@ -227,11 +230,10 @@ def render_sector_rotation(track_api_call):
             end_str = datetime.now().strftime('%Y-%m-%d')
             start_str = (datetime.now() - pd.Timedelta(days=90)).strftime('%Y-%m-%d')
             
-            sector_closes = {}
-            for sector_ticker_key in SECTOR_ETFS.keys():
-                data = fetch_sector_data(sector_ticker_key, start_str, end_str)
-                if not data.empty:
-                    sector_closes[sector_ticker_key] = data['Close'].iloc[-60:]
+            sector_closes = {
+                sector_ticker_key: data['Close'].iloc[-60:]
+                for sector_ticker_key, data in fetch_sector_data(tuple(SECTOR_ETFS), start_str, end_str).items()
+            }
             
             if sector_closes:
                 close_df = pd.DataFrame(sector_closes)
@@ -4,6 +4,7 @@ import plotly.graph_objects as go
 import streamlit.components.v1 as components
 
 # Import direct dependencies
+from services.analysis_pipeline import clear_analysis_failure
 from services.data_fetcher import fetch_stock_history, fetch_stock_info
 from fundamental_metrics import fetch_fundamental_data, format_large_number
 from services.logger import setup_logger
@@ -50,6 +51,7 @@ def render_stock_analysis(ticker, track_api_call, run_analysis_pipeline, calcula
         # Add Retry/Run Button if any data is missing
         if not ad.get('power_gauge') or not ad.get('weinstein') or not ad.get('canslim'):
             if st.button("🔄 Run Full Strategy Analysis", key="btn_run_full_analysis"):
+                clear_analysis_failure(ticker)
                 with st.spinner(f"Running multi-strategy analysis for {ticker}..."):
                     run_analysis_pipeline(ticker)
                     st.rerun()
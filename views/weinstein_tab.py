@@ -1,5 +1,6 @@
 import streamlit as st
 from weinstein import get_weinstein_stage
+from services.analysis_pipeline import clear_analysis_failure
 
 def render_weinstein(ticker):
     st.header(f"📉 Weinstein Stage Analysis: {ticker}")
@@ -42,5 +43,6 @@ def render_weinstein(ticker):
     elif not w_data and ticker:
         st.warning(f"⚠️ Stage Analysis data unavailable for {ticker}.")
         if st.button("Retry Stage Analysis", key="retry_weinstein"):
+             clear_analysis_failure(ticker)
              st.session_state.analysis_data = {'ticker': None} # Force reset
              st.rerun()